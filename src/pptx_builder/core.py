@@ -21,15 +21,59 @@ Notes:
     - No part of the image is stretched; scaling is always proportional.
 """
 
+import functools
+import hashlib
+import importlib
+import io
+import itertools
+import os
+import shutil
+import stat
 import sys
+import tempfile
 import logging
+import multiprocessing
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, List
-
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Sized,
+    Tuple,
+    Union,
+)
+
+import PIL
+from PIL import Image, ImageOps
+import pptx
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.opc.spec import image_content_types
+from pptx.parts.image import Image as PptxImage, ImagePart
+from pptx.parts.slide import SlidePart
+from pptx.shapes.picture import Picture
 from pptx.util import Inches, Emu
 from tqdm import tqdm
 
+try:
+    # Private python-pptx API, used only to save media uncompressed
+    from pptx.opc.serialized import PackageWriter, _ZipPkgWriter
+
+    STORED_MEDIA_WRITER = True
+except ImportError:  # pragma: no cover - save_presentation falls back to prs.save()
+    PackageWriter = _ZipPkgWriter = object  # type: ignore[misc,assignment]
+    STORED_MEDIA_WRITER = False
+
 # Set up module logger
 logger = logging.getLogger(__name__)
 
@@ -45,23 +89,81 @@ SLIDE_SIZES = {
     "6": ('Tabloid (17" x 11")', 17.0, 11.0),
 }
 
+# 1 inch = 914400 EMU (English Metric Units, PowerPoint's native length)
+EMU_PER_INCH = 914400
+
 # -----------------------------
-# File extensions we will accept
+# PDF rendering defaults
 # -----------------------------
-ALLOWED_EXTS = {
-    ".png",
-    ".jpg",
-    ".jpeg",
-    ".tif",
-    ".tiff",
-    ".webp",
-    ".bmp",
-    ".gif",
-    ".ico",
-    ".heic",
-    ".heif",
+# 150 DPI is sharp on any projector; 300 DPI costs 4x the pixels for print use
+DEFAULT_DPI = 150
+JPEG_QUALITY = 85
+
+# Image files are read, hashed and (optionally) downscaled on worker threads
+# ahead of slide assembly; the read-ahead window bounds how many prepared
+# images sit in memory at once
+IMAGE_WORKERS = os.cpu_count() or 1
+IMAGE_READAHEAD = 2 * IMAGE_WORKERS
+
+# Progress bars redraw at most this often (seconds); per-slide redraws cost
+# noticeable time next to fast slide assembly
+PROGRESS_MIN_INTERVAL = 0.5
+
+# Downscaling must shrink an image by at least this factor to be worth a re-encode
+# (skips 1px rounding differences, e.g. PDF pages rendered at the target DPI)
+DOWNSCALE_MIN_FACTOR = 0.9
+
+# Pillow modes the PNG encoder can write as-is; anything else (CMYK TIFFs, YCbCr,
+# float images, ...) is converted to RGB(A) before re-encoding as PNG
+PNG_MODES = frozenset({"1", "L", "LA", "I", "I;16", "P", "RGB", "RGBA"})
+
+# EXIF Orientation values (tag 274) that rotate the image by 90 or 270 degrees
+# when displayed, i.e. swap its width and height
+EXIF_ORIENTATION = 274
+EXIF_SWAPPED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+
+# Media formats that are already compressed; deflating them again costs CPU at
+# save time for ~0% size gain, so they are stored as-is in the .pptx zip
+STORED_MEDIA_EXTS = frozenset({"png", "jpg", "jpeg", "gif"})
+
+# An image to place on a slide: a file path, or an in-memory encoded image
+ImageSource = Union[Path, BinaryIO]
+
+# Media partname extension for each Pillow format python-pptx can embed (as in
+# pptx.parts.image.Image.ext)
+PPTX_IMAGE_EXTS = {
+    "BMP": "bmp",
+    "GIF": "gif",
+    "JPEG": "jpg",
+    "PNG": "png",
+    "TIFF": "tiff",
+    "WMF": "wmf",
 }
 
+# -----------------------------
+# File extensions we will accept
+# -----------------------------
+ALLOWED_EXTS = frozenset(
+    {
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".tif",
+        ".tiff",
+        ".webp",
+        ".bmp",
+        ".gif",
+        ".ico",
+        ".heic",
+        ".heif",
+    }
+)
+# Same, for str.endswith (checks every suffix in one C-level call)
+IMAGE_SUFFIXES = tuple(ALLOWED_EXTS)
+
+# Accepted suffixes Pillow only opens once pillow-heif is registered
+HEIF_EXTS = frozenset({".heic", ".heif"})
+
 
 def prompt_input_path() -> Path:
     """Ask the user for a path to a PDF file or a folder of images."""
@@ -115,116 +217,545 @@ def prompt_fit_mode() -> str:
         print("✗ Invalid choice. Please enter 1 or 2.\n")
 
 
+def scan_folder(folder: Path) -> Tuple[List[Path], List[Path], List[Path]]:
+    """
+    Read a folder once and return its (PDFs, images, subfolders), each sorted
+    case-insensitively by name. Symlinked folders are not listed as subfolders.
+    """
+    # scandir reports the file type with each entry, so only symlinks cost a stat,
+    # and names are checked as plain strings before any Path is built
+    pdfs: List[Tuple[str, str]] = []
+    images: List[Tuple[str, str]] = []
+    dirs: List[Tuple[str, str]] = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            # Lowercased once: it is both the suffix check and the sort key
+            lower = entry.name.lower()
+            if lower.endswith(".pdf") and entry.is_file():
+                pdfs.append((lower, entry.name))
+            elif lower.endswith(IMAGE_SUFFIXES) and entry.is_file():
+                images.append((lower, entry.name))
+            elif entry.is_dir(follow_symlinks=False):
+                dirs.append((lower, entry.name))
+
+    def paths(names: List[Tuple[str, str]]) -> List[Path]:
+        # Sort case-insensitively by filename (ties broken by exact name)
+        names.sort()
+        return [folder / name for _, name in names]
+
+    return paths(pdfs), paths(images), paths(dirs)
+
+
 def list_images(folder: Path) -> List[Path]:
     """Return sorted list of image files with allowed extensions (case-insensitive)."""
-    files = [p for p in folder.iterdir() if p.is_file() and p.suffix.lower() in ALLOWED_EXTS]
-    # Sort case-insensitively by filename
-    files.sort(key=lambda p: p.name.lower())
-    return files
+    return scan_folder(folder)[1]
+
+
+def folder_has_images(folder: Path) -> bool:
+    """Return True as soon as the folder is found to hold one allowed image file."""
+    # Stops at the first match instead of listing and sorting the whole folder
+    with os.scandir(folder) as entries:
+        return any(
+            entry.name.lower().endswith(IMAGE_SUFFIXES) and entry.is_file() for entry in entries
+        )
 
 
 def emu_to_float_inches(emu: Emu) -> float:
     """Convert EMU to inches (pptx.util.Inches wraps conversion, but we need a float)."""
-    # 1 inch = 914400 EMU
-    return float(emu) / 914400.0
+    return float(emu) / EMU_PER_INCH
 
 
-def place_picture_fit(slide, img_path: Path, slide_w_emu: int, slide_h_emu: int):
+class ImagePartCache:
     """
-    Place the image on the slide using 'contain' behavior:
-        - Scale proportionally so the entire image is visible (no cropping).
-        - Center the image; background may show (letterbox/pillarbox).
-    Implementation detail:
-        - Insert at natural size first to read pic.width/height (requires Pillow via python-pptx).
-        - Compute scale ratio and then set final size and position.
+    Image parts embedded in one deck, keyed by SHA-1 of their bytes.
+
+    Repeated content (even under different paths) reuses its part. New parts get
+    the next media partname from a counter: python-pptx's next_image_partname
+    walks every part in the package per call, which made decks of N distinct
+    images O(N^2) to build. Pictures are then inserted through private python-pptx
+    API; where it is missing, add_picture_cached uses shapes.add_picture.
     """
-    pic = slide.shapes.add_picture(str(img_path), left=0, top=0)  # natural size first
-    img_w = float(pic.width)
-    img_h = float(pic.height)
-    sw = float(slide_w_emu)
-    sh = float(slide_h_emu)
 
-    # Scale to "contain": use the smaller ratio
-    scale = min(sw / img_w, sh / img_h)
-    new_w = img_w * scale
-    new_h = img_h * scale
+    @staticmethod
+    def supported(shapes) -> bool:
+        """Whether this python-pptx has the shape-tree internals add_picture_cached uses."""
+        # On the class: _next_shape_id is a property that scans the slide
+        return (
+            hasattr(shapes, "_grpSp")
+            and hasattr(type(shapes), "_next_shape_id")
+            and hasattr(type(shapes), "_add_pic_from_image_part")
+        )
+
+    def __init__(self, package):
+        self._package = package
+        self._parts: Dict[str, ImagePart] = {}
+        self._next_idx: Optional[int] = None
+
+    def get_or_add(
+        self, digest: str, blob: bytes, filename: Optional[str] = None, fmt: Optional[str] = None
+    ) -> ImagePart:
+        """
+        Return the part for this content, adding it if new. `fmt` is the Pillow
+        format when already probed; otherwise python-pptx probes the bytes again.
+        """
+        image_part = self._parts.get(digest)
+        if image_part is not None:
+            return image_part
+
+        if self._next_idx is None:
+            # One scan for media already in the package (the default template has none)
+            self._next_idx = 1 + max(
+                (
+                    part.partname.idx or 0
+                    for part in self._package.iter_parts()
+                    if part.partname.startswith("/ppt/media/image")
+                ),
+                default=0,
+            )
+        ext = PPTX_IMAGE_EXTS.get(fmt) if fmt else None
+        if ext is None:
+            # Raises ValueError for formats a deck cannot hold
+            ext = PptxImage.from_blob(blob, filename).ext
+        # Keywords: python-pptx < 1.0 orders blob/package differently
+        image_part = ImagePart(
+            partname=PackURI(f"/ppt/media/image{self._next_idx}.{ext}"),
+            content_type=image_content_types[ext],
+            package=self._package,
+            blob=blob,
+            filename=filename,
+        )
+        self._next_idx += 1
+        self._parts[digest] = image_part
+        return image_part
 
-    # Center
-    left = (sw - new_w) / 2.0
-    top = (sh - new_h) / 2.0
 
-    pic.left = int(left)
-    pic.top = int(top)
-    pic.width = int(new_w)
-    pic.height = int(new_h)
+class SlideAppender:
+    """
+    Appends slides based on one layout, like prs.slides.add_slide(layout).
+
+    python-pptx's add_slide scans every relationship of the presentation part for
+    an existing link to the (brand-new) slide part, and every slide ID for the
+    next free one, so a deck of N slides was O(N^2) to build. Here the slide
+    number and ID come from counters and the relationship is added directly.
+    That relies on private python-pptx API; where it is missing, every slide
+    goes through add_slide.
+    """
+
+    # Valid p:sldId ids (ECMA-376); past the top, fall back to python-pptx's search
+    MAX_SLIDE_ID = 2147483647
 
+    @staticmethod
+    def supported(prs) -> bool:
+        """Whether this python-pptx has the internals the fast path uses."""
+        return (
+            hasattr(prs.part, "_element")
+            and hasattr(prs.part.rels, "_add_relationship")
+            and hasattr(SlidePart, "new")
+        )
+
+    def __init__(self, prs, layout):
+        self._prs = prs
+        self._layout = layout
+        if not self.supported(prs):
+            self._next_id = self.MAX_SLIDE_ID + 1  # always fall back
+            return
+        self._sldIdLst = prs.part._element.get_or_add_sldIdLst()
+        # Usually none: the blank layout has no placeholders to clone
+        self._placeholders = list(layout.iter_cloneable_placeholders())
+        self._next_number = len(self._sldIdLst) + 1
+        self._next_id = max([255] + [sldId.id for sldId in self._sldIdLst.sldId_lst]) + 1
+
+    def add_slide(self):
+        if self._next_id > self.MAX_SLIDE_ID:
+            return self._prs.slides.add_slide(self._layout)
+
+        prs_part = self._prs.part
+        partname = PackURI(f"/ppt/slides/slide{self._next_number}.xml")
+        slide_part = SlidePart.new(partname, prs_part.package, self._layout.part)
+        rId = prs_part.rels._add_relationship(RT.SLIDE, slide_part)
+        slide = slide_part.slide
+        for placeholder in self._placeholders:
+            slide.shapes.clone_placeholder(placeholder)
+        self._sldIdLst._add_sldId(id=self._next_id, rId=rId)
+
+        self._next_number += 1
+        self._next_id += 1
+        return slide
+
+
+def add_picture_cached(
+    slide,
+    img_path: ImageSource,
+    image_parts: Optional[ImagePartCache] = None,
+    blob: Optional[bytes] = None,
+    digest: Optional[str] = None,
+    left: int = 0,
+    top: int = 0,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    fmt: Optional[str] = None,
+):
+    """
+    Add the image to the slide at the given position and size (EMU).
+
+    Width/height default to the image's natural size, as with add_picture.
+
+    With an ImagePartCache for the deck, repeated content reuses its image part
+    and new content skips python-pptx's scans of every part in the package (for a
+    duplicate, and for a free partname). `blob`/`digest`/`fmt` may be passed in
+    when the file was already read and probed (see iter_image_blobs).
+    """
+    if image_parts is not None and not ImagePartCache.supported(slide.shapes):
+        image_parts = None
+        if blob is not None:
+            img_path = io.BytesIO(blob)  # may be downscaled or converted; keep those bytes
+    if image_parts is None:
+        if isinstance(img_path, Path):
+            return slide.shapes.add_picture(str(img_path), left, top, width, height)
+        img_path.seek(0)
+        return slide.shapes.add_picture(img_path, left, top, width, height)
+
+    if blob is None:
+        blob = read_source(img_path)
+    if digest is None:
+        digest = hashlib.sha1(blob).hexdigest()
+    filename = img_path.name if isinstance(img_path, Path) else None
+    image_part = image_parts.get_or_add(digest, blob, filename, fmt)
+
+    rId = slide.part.relate_to(image_part, RT.IMAGE)
+    shapes = slide.shapes
+    if width is None or height is None:
+        pic_elm = shapes._add_pic_from_image_part(image_part, rId, left, top, width, height)
+    else:
+        # What _add_pic_from_image_part builds, minus its ImagePart.scale() call:
+        # that reads the image's native size (two more Pillow opens of the blob)
+        # even when both dimensions are given
+        shape_id = shapes._next_shape_id
+        pic_elm = shapes._grpSp.add_pic(
+            shape_id, f"Picture {shape_id - 1}", image_part.desc, rId, left, top, width, height
+        )
+    return Picture(pic_elm, shapes)
+
+
+def read_source(img: ImageSource) -> bytes:
+    """Return the encoded bytes of an image file or in-memory image."""
+    if isinstance(img, Path):
+        return img.read_bytes()
+    if isinstance(img, io.BytesIO):
+        # No copy for a buffer built from bytes and never written to (e.g. a
+        # rendered page): getvalue() hands back that same bytes object
+        return img.getvalue()
+    img.seek(0)
+    return img.read()
+
+
+def downscale_blob(
+    blob: bytes, slide_width_in: float, slide_height_in: float, mode: str, max_dpi: int
+) -> bytes:
+    """
+    Shrink an encoded image to at most max_dpi pixels per inch of its on-slide size.
+
+    The on-slide size follows the placement mode ("fit" or "fill"). Images already
+    at or below that resolution are returned unchanged; downscaled JPEGs stay JPEG,
+    anything else becomes PNG (keeps transparency).
+    """
+    with Image.open(io.BytesIO(blob)) as im:
+        iw, ih = oriented_size(im)
+        # Slide inches per image pixel once placed
+        pick = min if mode == "fit" else max
+        factor = pick(slide_width_in / iw, slide_height_in / ih) * max_dpi
+        if factor >= DOWNSCALE_MIN_FACTOR:
+            return blob
+
+        fmt = "JPEG" if im.format == "JPEG" else "PNG"
+        # thumbnail() lets JPEG decoding scale down early (draft mode)
+        w, h = im.size
+        im.thumbnail(
+            (max(1, round(w * factor)), max(1, round(h * factor))), Image.Resampling.LANCZOS
+        )
+        # The re-encode drops EXIF, so bake the orientation into the pixels
+        upright = ImageOps.exif_transpose(im)
+        out = io.BytesIO()
+        if fmt == "JPEG":
+            upright.save(out, fmt, quality=JPEG_QUALITY)
+        else:
+            png_ready(upright).save(out, fmt)
+        return out.getvalue()
+
+
+def png_ready(im: Image.Image) -> Image.Image:
+    """Return im, or an RGB/RGBA copy if PNG cannot store its mode (e.g. CMYK, YCbCr)."""
+    if im.mode in PNG_MODES:
+        return im
+    return im.convert("RGBA" if "A" in im.getbands() else "RGB")
+
+
+def oriented_size(im: Image.Image) -> Tuple[int, int]:
+    """Return im's (width, height) as displayed, i.e. swapped for EXIF 90/270 rotations."""
+    w, h = im.size
+    if im.getexif().get(EXIF_ORIENTATION) in EXIF_SWAPPED_ORIENTATIONS:
+        return h, w
+    return w, h
 
-def place_picture_fill(slide, img_path: Path, slide_w_emu: int, slide_h_emu: int):
+
+def probe_image(blob: bytes) -> Tuple[Tuple[int, int], Optional[str]]:
+    """
+    Return the displayed (width, height) in pixels and the Pillow format of an
+    encoded image (header and EXIF read only, no pixels decoded).
     """
-    Place the image on the slide using 'cover' behavior:
-        - Scale proportionally so the slide is fully covered.
-        - May crop the image (overflow outside slide bounds is not visible).
-        - Center the image.
+    with Image.open(io.BytesIO(blob)) as im:
+        return oriented_size(im), im.format
+
+
+@functools.lru_cache(maxsize=1)
+def register_heif_opener() -> bool:
     """
-    pic = slide.shapes.add_picture(str(img_path), left=0, top=0)  # natural size first
-    img_w = float(pic.width)
-    img_h = float(pic.height)
+    Let Pillow open HEIC/HEIF files, on first use; False without pillow-heif.
+
+    Importing pillow-heif takes ~25ms, so decks without HEIC never pay for it.
+    """
+    try:
+        import pillow_heif
+    except ImportError:
+        return False
+    pillow_heif.register_heif_opener()
+    return True
+
+
+def encode_png(blob: bytes) -> bytes:
+    """Re-encode an image as PNG, with its EXIF rotation applied to the pixels."""
+    with Image.open(io.BytesIO(blob)) as im:
+        upright = ImageOps.exif_transpose(im)
+    out = io.BytesIO()
+    png_ready(upright).save(out, "PNG")
+    return out.getvalue()
+
+
+def read_image(
+    img: ImageSource, transform: Optional[Callable[[bytes], bytes]] = None
+) -> Tuple[ImageSource, bytes, str, Tuple[int, int], Optional[str]]:
+    """
+    Return (source, bytes, SHA-1 hex digest, pixel size, format) for an image.
+
+    The digest is always of the source bytes; `transform` (e.g. downscale_blob)
+    only changes the bytes that get embedded. Formats a deck cannot hold (WebP,
+    HEIC, ICO, ...) are converted to PNG; all others are embedded as they are.
+    Size and format are of the embedded bytes, probed once here and shared by
+    slide geometry and the image part.
+    """
+    if isinstance(img, Path) and img.suffix.lower() in HEIF_EXTS:
+        register_heif_opener()
+    blob = read_source(img)
+    digest = hashlib.sha1(blob).hexdigest()
+    if transform is not None:
+        blob = transform(blob)
+    size, fmt = probe_image(blob)
+    if fmt not in PPTX_IMAGE_EXTS:
+        blob, fmt = encode_png(blob), "PNG"
+    return img, blob, digest, size, fmt
+
+
+def iter_image_blobs(
+    images: Iterable[ImageSource],
+    transform: Optional[Callable[[bytes], bytes]] = None,
+) -> Iterator[Tuple[ImageSource, bytes, str, Tuple[int, int], Optional[str]]]:
+    """
+    Yield read_image() results in order, preparing up to IMAGE_READAHEAD images ahead
+    on IMAGE_WORKERS threads.
+
+    File reads, hashing and Pillow resizing release the GIL, so they run in parallel
+    with each other and with slide assembly, which stays on the calling thread
+    (python-pptx's package tree is not thread-safe). `images` is consumed lazily,
+    so a streaming source (iter_pdf_images) still works.
+    """
+    with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as executor:
+        pending: deque = deque()
+        for img in images:
+            pending.append(executor.submit(read_image, img, transform))
+            if len(pending) >= IMAGE_READAHEAD:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+@functools.lru_cache(maxsize=256)
+def picture_geometry(
+    img_w: int, img_h: int, slide_w_emu: int, slide_h_emu: int, cover: bool
+) -> Tuple[int, int, int, int]:
+    """
+    Return (left, top, width, height) in EMU for an img_w x img_h image centered on
+    the slide, scaled to be fully visible ("contain") or, with cover=True, to fully
+    cover the slide. Memoized: decks usually repeat a handful of image sizes (every
+    page of a PDF, every shot from one camera), so most slides are a cache hit.
+    """
+    iw = float(img_w)
+    ih = float(img_h)
     sw = float(slide_w_emu)
     sh = float(slide_h_emu)
 
-    # Scale to "cover": use the larger ratio
-    scale = max(sw / img_w, sh / img_h)
-    new_w = img_w * scale
-    new_h = img_h * scale
+    # Contain uses the smaller ratio, cover the larger
+    scale = max(sw / iw, sh / ih) if cover else min(sw / iw, sh / ih)
+    new_w = iw * scale
+    new_h = ih * scale
 
-    # Center (image may overflow the slide; that's fine)
+    # Center (with cover the image may overflow the slide; that's fine)
     left = (sw - new_w) / 2.0
     top = (sh - new_h) / 2.0
+    return int(left), int(top), int(new_w), int(new_h)
+
+
+def place_picture(
+    slide,
+    img_path: ImageSource,
+    slide_w_emu: int,
+    slide_h_emu: int,
+    cover: bool = False,
+    image_parts: Optional[ImagePartCache] = None,
+    blob: Optional[bytes] = None,
+    digest: Optional[str] = None,
+    size: Optional[Tuple[int, int]] = None,
+    fmt: Optional[str] = None,
+):
+    """
+    Place the image on the slide, centered and scaled proportionally:
+        - 'contain' (cover=False): the entire image is visible, no cropping;
+          background may show (letterbox/pillarbox).
+        - 'cover' (cover=True): the slide is fully covered; the image may be
+          cropped (overflow outside slide bounds is not visible).
+    Implementation detail:
+        - Only the pixel aspect ratio matters, so the size comes from a header-only
+          probe (or `size`/`fmt`, when already known) and the picture is inserted
+          once at its final geometry.
+    """
+    if blob is None:
+        blob = read_source(img_path)
+    if size is None:
+        size, fmt = probe_image(blob)
+    geometry = picture_geometry(size[0], size[1], slide_w_emu, slide_h_emu, cover)
+    return add_picture_cached(slide, img_path, image_parts, blob, digest, *geometry, fmt=fmt)
+
+
+class StoredMediaZipWriter(_ZipPkgWriter):
+    """python-pptx zip writer that stores already-compressed media uncompressed."""
+
+    def write(self, pack_uri, blob: bytes) -> None:
+        if pack_uri.ext.lower() in STORED_MEDIA_EXTS:
+            self._zipf.writestr(pack_uri.membername, blob, compress_type=zipfile.ZIP_STORED)
+        else:
+            self._zipf.writestr(pack_uri.membername, blob)
+
+
+class StoredMediaPackageWriter(PackageWriter):
+    """PackageWriter that writes through StoredMediaZipWriter."""
 
-    pic.left = int(left)
-    pic.top = int(top)
-    pic.width = int(new_w)
-    pic.height = int(new_h)
+    def _write(self) -> None:
+        with StoredMediaZipWriter(self._pkg_file) as phys_writer:
+            self._write_content_types_stream(phys_writer)
+            self._write_pkg_rels(phys_writer)
+            self._write_parts(phys_writer)
+
+
+def save_presentation(prs, output_path: Path) -> None:
+    """
+    Save like prs.save(), but without re-deflating embedded PNG/JPEG/GIF media.
+
+    XML parts are still deflated; only the media step, which dominates save time
+    on image decks, is skipped. The result is a regular .pptx. Falls back to
+    prs.save() on python-pptx versions without the private writer classes.
+    """
+    package = prs.part.package
+    if not STORED_MEDIA_WRITER or not hasattr(package, "_rels"):
+        prs.save(str(output_path))
+        return
+    StoredMediaPackageWriter.write(str(output_path), package._rels, tuple(package.iter_parts()))
 
 
 def confirm_overwrite(path: Path, quiet: bool = False, force: bool = False) -> bool:
-    if not path.exists():
-        return True
-    if quiet or force:
+    if quiet or force or not path.exists():
         return True
     reply = input(f"⚠️  File exists: {path.name}. Overwrite? [y/N]: ").strip().lower()
     return reply == "y"
 
 
+@functools.lru_cache(maxsize=1)
+def default_template_bytes() -> bytes:
+    """Return python-pptx's default template, read from disk once per process."""
+    path = os.path.join(os.path.dirname(pptx.__file__), "templates", "default.pptx")
+    with open(path, "rb") as f:
+        return f.read()
+
+
 def build_presentation(
-    images: List[Path],
+    images: Iterable[ImageSource],
     output_path: Path,
     slide_width_in: float,
     slide_height_in: float,
     mode: str,
     show_progress: bool = False,
+    slide_width_emu: Optional[int] = None,
+    slide_height_emu: Optional[int] = None,
+    max_image_dpi: Optional[int] = None,
+    pdf_pages: Iterable[ImageSource] = (),
 ) -> None:
-    """Create the PPTX."""
-    prs = Presentation()
-    prs.slide_width = Inches(slide_width_in)
-    prs.slide_height = Inches(slide_height_in)
-
-    # Cache slide size in EMU for math (we just set these, so they're not None)
-    sw_emu = int(prs.slide_width)  # type: ignore[arg-type]
-    sh_emu = int(prs.slide_height)  # type: ignore[arg-type]
-
+    """
+    Create the PPTX.
+
+    `images` may be any iterable of paths or in-memory images (e.g. the generator
+    from iter_pdf_images), so slides can be appended while pages are still being
+    rasterized. Callers with
+    precomputed EMU slide dimensions can pass them to skip the inch conversion.
+    With `max_image_dpi`, images with more pixels than that density needs on the
+    slide are downscaled before embedding (smaller file, faster save).
+
+    `pdf_pages` (rendered PDF pages, e.g. from iter_pdf_images) get one slide each,
+    before `images`. They are embedded exactly as rendered: the caller already
+    picked their DPI, so `max_image_dpi` never resamples them.
+    """
+    # Slide size in EMU for math
+    sw_emu = slide_width_emu if slide_width_emu is not None else int(Inches(slide_width_in))
+    sh_emu = slide_height_emu if slide_height_emu is not None else int(Inches(slide_height_in))
+
+    # Same deck Presentation() would open, without re-reading it for every build
+    prs = Presentation(io.BytesIO(default_template_bytes()))
+    prs.slide_width = Emu(sw_emu)
+    prs.slide_height = Emu(sh_emu)
+
+    # Image parts already embedded in this deck, keyed by content SHA-1
+    image_parts = ImagePartCache(prs.part.package)
+
+    transform = None
+    if max_image_dpi:
+        transform = functools.partial(
+            downscale_blob,
+            slide_width_in=sw_emu / EMU_PER_INCH,
+            slide_height_in=sh_emu / EMU_PER_INCH,
+            mode=mode,
+            max_dpi=max_image_dpi,
+        )
+    cover = mode != "fit"
+    # Looked up once: each slide_layouts access re-reads the layout list XML
+    add_slide = SlideAppender(prs, prs.slide_layouts[6]).add_slide  # blank
+    blobs: Iterable[Tuple[ImageSource, bytes, str, Tuple[int, int], Optional[str]]]
+    blobs = itertools.chain(iter_image_blobs(pdf_pages), iter_image_blobs(images, transform))
     # Create slides with optional progress bar
-    image_iter = tqdm(images, desc="Building slides", unit="slide") if show_progress else images
-    for img in image_iter:
-        slide = prs.slides.add_slide(prs.slide_layouts[6])  # blank
-        if mode == "fit":
-            place_picture_fit(slide, img, sw_emu, sh_emu)
-        else:
-            place_picture_fill(slide, img, sw_emu, sh_emu)
+    if show_progress:
+        total = None
+        if isinstance(pdf_pages, Sized) and isinstance(images, Sized):
+            total = len(pdf_pages) + len(images)
+        blobs = tqdm(
+            blobs,
+            total=total,
+            desc="Building slides",
+            unit="slide",
+            mininterval=PROGRESS_MIN_INTERVAL,
+        )
+    for img, blob, digest, size, fmt in blobs:
+        slide = add_slide()
+        place_picture(slide, img, sw_emu, sh_emu, cover, image_parts, blob, digest, size, fmt)
 
     if show_progress:
         print("Saving presentation...")
-    prs.save(str(output_path))
+    save_presentation(prs, output_path)
 
 
 # ===[ SECTION: CLI ARGUMENTS ]=====================================
@@ -255,7 +786,26 @@ def parse_cli_args():
     )
 
     parser.add_argument(
-        "--dpi", type=int, default=300, help="DPI for PDF rendering (default: 300)."
+        "--dpi",
+        type=int,
+        default=DEFAULT_DPI,
+        help=f"DPI for PDF rendering (default: {DEFAULT_DPI}).",
+    )
+
+    parser.add_argument(
+        "--max-image-dpi",
+        type=int,
+        metavar="DPI",
+        help="Downscale image files that exceed this DPI at their on-slide size; "
+        "PDF pages are rendered at --dpi instead (default: embed images at full resolution).",
+    )
+
+    parser.add_argument(
+        "--pdf-image-format",
+        choices=PDF_IMAGE_FORMATS,
+        default="auto",
+        help="Image format for rendered PDF pages: 'auto' uses JPEG for photographic "
+        "pages and PNG for text and diagrams (default: auto).",
     )
 
     parser.add_argument(
@@ -288,92 +838,414 @@ def parse_cli_args():
 
 # ===[ SECTION: INPUT HANDLING ]====================================
 
-from pdf2image import convert_from_path  # noqa: E402
+# Pages rasterized per worker task; bounds how many rendered pages sit in memory
+PDF_RENDER_BATCH = 8
+
+# Worker processes rasterizing page batches at once (MuPDF holds the GIL while
+# rendering, so batches need separate processes to use separate cores)
+PDF_RENDER_WORKERS = os.cpu_count() or 1
+
+# With fmt="auto", pages with more distinct colors than this are treated as
+# continuous-tone (photos, scans) and saved as JPEG. Anti-aliased text and line
+# art stay well below it and keep lossless PNG. Colors are counted on a sample
+# about PDF_COLOR_SAMPLE_SIZE px on its long side (see page_color_count), which
+# keeps the count cheap and roughly independent of the render DPI.
+PDF_JPEG_MIN_COLORS = 2048
+PDF_COLOR_SAMPLE_SIZE = 400
+
+PDF_IMAGE_FORMATS = ("auto", "png", "jpeg")
+
+# PDFs the CLI converts at once when given several
+CLI_PDF_WORKERS = os.cpu_count() or 1
 
 
 def detect_input_type(path: Path) -> str:
     """Return 'pdf', 'folder', or 'unknown' based on the given path."""
-    if path.is_file() and path.suffix.lower() == ".pdf":
+    # One stat answers both "file?" and "folder?"
+    try:
+        mode = path.stat().st_mode
+    except OSError:
+        return "unknown"
+    if stat.S_ISREG(mode) and path.suffix.lower() == ".pdf":
         return "pdf"
-    if path.is_dir():
-        # check if folder contains images
-        imgs = list_images(path)
-        if imgs:
-            return "folder"
+    if stat.S_ISDIR(mode) and folder_has_images(path):
+        return "folder"
     return "unknown"
 
 
-def convert_pdf_to_images(pdf_path: Path, dpi: int) -> List[Path]:
-    """Convert PDF pages to temporary PNG files."""
-    import tempfile  # noqa: E402
+def prefetch_file(path: Path) -> None:
+    """
+    Ask the kernel to start reading the whole file into the page cache.
+
+    Every render worker opens the PDF for its own page batch; with the file already
+    cached those reads are served from memory instead of disk. A no-op where
+    posix_fadvise is unavailable (macOS, Windows).
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # The converter will report the real error
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass  # Hint only
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
+def import_fitz() -> Any:
+    """
+    Import PyMuPDF on first use.
+
+    It is only needed for PDF input, and loading its shared library is a large
+    part of CLI startup, so image-only runs and --help never pay for it.
+    """
+    try:
+        return importlib.import_module("pymupdf")  # PyMuPDF >= 1.24.3
+    except ImportError:  # pragma: no cover - older PyMuPDF only ships the fitz name
+        return importlib.import_module("fitz")
+
+
+def pdf_page_count(pdf_path: Path) -> int:
+    """Return the number of pages in a PDF."""
+    fitz = import_fitz()
+    with fitz.open(pdf_path) as doc:
+        return int(doc.page_count)
+
+
+def page_color_count(pix: Any) -> int:
+    """
+    Count the distinct colors of a rendered page, on a downsampled copy if it is large.
+
+    Pixmap.color_count() walks every pixel, about half a second per page at
+    300 DPI; a box-filtered sample is ~10x faster and classifies pages the same way.
+    """
+    step = max(pix.width, pix.height) // PDF_COLOR_SAMPLE_SIZE
+    if step > 1:
+        pix = import_fitz().Pixmap(pix, pix.width // step, pix.height // step, None)
+    return int(pix.color_count())
+
+
+def render_pdf_batch(
+    pdf_path: Path,
+    dpi: int,
+    first: int,
+    last: int,
+    temp_dir: Optional[Path],
+    fmt: str = "png",
+) -> List[ImageSource]:
+    """
+    Rasterize pages first..last (1-based, inclusive) and return them in order.
+
+    Pages are saved into temp_dir and returned as paths, or, with temp_dir=None,
+    encoded into in-memory buffers so nothing touches the disk. Opens its own
+    document, so batches can run in separate processes. With fmt="auto" the
+    format is picked per page (see PDF_JPEG_MIN_COLORS).
+    """
+    fitz = import_fitz()
+    dpi = int(round(dpi))  # set_dpi() only takes ints; API callers may pass 150.0
+    logger.debug("Rendering pages %d-%d with dpi=%d", first, last, dpi)
+    out: List[ImageSource] = []
+    # One scale matrix for the whole batch (PDF space is 72 points per inch)
+    matrix = fitz.Matrix(dpi / 72.0, dpi / 72.0)
+    with fitz.open(pdf_path) as doc:
+        for i in range(first, last + 1):
+            pix = doc.load_page(i - 1).get_pixmap(matrix=matrix, alpha=False)
+            pix.set_dpi(dpi, dpi)  # Keep the resolution tag get_pixmap(dpi=...) would set
+            page_fmt = fmt
+            if fmt == "auto":
+                page_fmt = "jpeg" if page_color_count(pix) > PDF_JPEG_MIN_COLORS else "png"
+            target: ImageSource
+            if temp_dir is None:
+                if page_fmt == "jpeg":
+                    target = io.BytesIO(pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY))
+                else:
+                    target = io.BytesIO(pix.tobytes("png"))
+            else:
+                ext = "jpg" if page_fmt == "jpeg" else "png"
+                target = temp_dir / f"page_{i:04d}.{ext}"
+                if page_fmt == "jpeg":
+                    pix.save(target.as_posix(), jpg_quality=JPEG_QUALITY)
+                else:
+                    pix.save(target.as_posix())
+            # Free this page's pixel buffer before the next one is allocated, so
+            # the allocator can hand the same block back instead of holding two
+            del pix
+            logger.debug("Rendered page %d to %s", i, target)
+            out.append(target)
+    return out
+
+
+def iter_pdf_images(
+    pdf_path: Path,
+    dpi: int,
+    temp_dir: Optional[Path],
+    page_count: Optional[int] = None,
+    fmt: str = "png",
+) -> Iterator[ImageSource]:
+    """
+    Rasterize PDF pages into temp_dir, yielding each image path once it is written.
+    With temp_dir=None, pages are yielded as in-memory buffers instead (no disk
+    round-trip; build_presentation accepts either).
+
+    Pages are rendered in batches of up to PDF_RENDER_BATCH, spread over up to
+    PDF_RENDER_WORKERS processes with one batch in flight per worker, so peak
+    memory stays flat no matter how long the PDF is. Paths are yielded in page
+    order. `fmt` is "png" (lossless), "jpeg" (much smaller, for previews and
+    scans) or "auto" (JPEG only for photographic pages).
+    """
+    prefetch_file(pdf_path)
+    if page_count is None:
+        page_count = pdf_page_count(pdf_path)
+
+    # Short PDFs are split finer so every worker gets pages
+    batch = max(1, min(PDF_RENDER_BATCH, -(-page_count // PDF_RENDER_WORKERS)))
+    batches = [
+        (first, min(first + batch - 1, page_count)) for first in range(1, page_count + 1, batch)
+    ]
+    workers = min(PDF_RENDER_WORKERS, len(batches))
+
+    # Inside any worker process (a web or CLI pool, or a caller's own pool), pages
+    # are rendered in-process: the outer pool already uses the cores, and a page
+    # pool per worker would multiply the process count (daemonic workers cannot
+    # start children at all)
+    if workers <= 1 or multiprocessing.parent_process() is not None:
+        for first, last in batches:
+            yield from render_pdf_batch(pdf_path, dpi, first, last, temp_dir, fmt)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        for first, last in batches:
+            pending.append(
+                executor.submit(render_pdf_batch, pdf_path, dpi, first, last, temp_dir, fmt)
+            )
+            if len(pending) >= workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def convert_pdf_to_images(
+    pdf_path: Path, dpi: int, fmt: str = "png", temp_root: Optional[Path] = None
+) -> List[Path]:
+    """
+    Convert PDF pages to temporary PNG (or JPEG, with fmt="jpeg" or "auto") files.
 
-    logger.debug(f"Starting PDF conversion: {pdf_path}")
-    logger.debug(f"PDF exists: {pdf_path.exists()}")
-    logger.debug(f"PDF size: {pdf_path.stat().st_size if pdf_path.exists() else 'N/A'}")
+    Pages go in a fresh directory under temp_root (default: the system temp dir).
+    """
+    logger.debug("Starting PDF conversion: %s", pdf_path)
+    # The existence/size details cost two stat calls, so only when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("PDF exists: %s", pdf_path.exists())
+        logger.debug("PDF size: %s", pdf_path.stat().st_size if pdf_path.exists() else "N/A")
 
-    temp_dir = Path(tempfile.mkdtemp(prefix="pptx_pdf_"))
-    logger.debug(f"Created temp dir: {temp_dir}")
+    temp_dir = Path(tempfile.mkdtemp(prefix="pptx_pdf_", dir=temp_root))
+    logger.debug("Created temp dir: %s", temp_dir)
 
     try:
-        logger.debug(f"Calling convert_from_path with dpi={dpi}")
-        pages = convert_from_path(pdf_path.as_posix(), dpi=dpi)
-        logger.debug(f"Got {len(pages)} pages from PDF")
-        out_paths = []
+        page_count = pdf_page_count(pdf_path)
+        logger.debug("PDF has %d pages", page_count)
 
         # Convert pages with progress bar
         page_iter = tqdm(
-            enumerate(pages, start=1),
-            total=len(pages),
+            iter_pdf_images(pdf_path, dpi, temp_dir, page_count=page_count, fmt=fmt),
+            total=page_count,
             desc="Converting PDF pages",
             unit="page",
+            mininterval=PROGRESS_MIN_INTERVAL,
         )
-        for i, page in page_iter:
-            out_path = temp_dir / f"page_{i:04d}.png"
-            page.save(out_path, "PNG")
-            out_paths.append(out_path)
-            logger.debug(f"Saved page {i} to {out_path}")
+        out_paths = list(page_iter)
 
-        logger.debug(f"Successfully converted {len(out_paths)} pages")
+        logger.debug("Successfully converted %d pages", len(out_paths))
         return out_paths
     except Exception as e:
         # Clean up temp directory on failure
-        import shutil
-        import traceback
-
-        logger.error(f"PDF conversion failed: {e}")
-        logger.debug(f"Traceback:\n{traceback.format_exc()}")
+        logger.error("PDF conversion failed: %s", e)
+        logger.debug("Traceback:", exc_info=True)
         if temp_dir.exists():
             shutil.rmtree(temp_dir)
         raise RuntimeError(f"Failed to convert PDF: {e}")
 
 
+def stream_pdf_pages(
+    pdf_path: Path,
+    dpi: int,
+    fmt: str = "png",
+    show_progress: bool = True,
+    page_count: Optional[int] = None,
+) -> Iterator[BinaryIO]:
+    """
+    Yield PDF pages as in-memory PNG (or JPEG, with fmt="jpeg" or "auto") images,
+    rendered as they are consumed.
+
+    Pass the generator straight to build_presentation(pdf_pages=...): only the
+    render window is held on top of the deck itself, and nothing is written to
+    disk. Pass `page_count` when already known to skip opening the PDF just to
+    count pages.
+    """
+    logger.debug("Starting in-memory PDF conversion: %s", pdf_path)
+    try:
+        if page_count is None:
+            page_count = pdf_page_count(pdf_path)
+        logger.debug("PDF has %d pages", page_count)
+
+        yield from tqdm(
+            iter_pdf_images(pdf_path, dpi, None, page_count=page_count, fmt=fmt),
+            total=page_count,
+            desc="Converting PDF pages",
+            unit="page",
+            mininterval=PROGRESS_MIN_INTERVAL,
+            disable=not show_progress,
+        )
+    except Exception as e:
+        logger.error("PDF conversion failed: %s", e)
+        raise RuntimeError(f"Failed to convert PDF: {e}")
+
+
+def convert_pdf_to_streams(
+    pdf_path: Path,
+    dpi: int,
+    fmt: str = "png",
+    show_progress: bool = True,
+    page_count: Optional[int] = None,
+) -> List[BinaryIO]:
+    """
+    Convert PDF pages to a list of in-memory images (see stream_pdf_pages).
+
+    Kept for API compatibility: the list holds every page at once, so new code
+    should stream the pages into build_presentation instead.
+    """
+    return list(stream_pdf_pages(pdf_path, dpi, fmt, show_progress, page_count))
+
+
 def pdf_first_page_size_inches(pdf_path: Path) -> Tuple[float, float]:
     """
     Return (width_in, height_in) for the first page of a PDF.
     Uses 72 PDF points per inch via PyMuPDF (fitz).
     """
-    import fitz  # PyMuPDF
+    return pdf_page_count_and_size(pdf_path)[1]
+
 
+def pdf_page_count_and_size(pdf_path: Path) -> Tuple[int, Tuple[float, float]]:
+    """
+    Return the page count and first-page (width_in, height_in) of a PDF, from a
+    single open of the document.
+    """
+    fitz = import_fitz()
     with fitz.open(pdf_path) as doc:
         if doc.page_count == 0:
             # safe fallback to 16:9 if something is odd
-            return 13.3333, 7.5
+            return 0, (13.3333, 7.5)
         p0 = doc[0]
         w_in = p0.rect.width / 72.0
         h_in = p0.rect.height / 72.0
-        return (w_in, h_in)
+        return int(doc.page_count), (w_in, h_in)
 
 
-def process_folder(folder: Path, recursive: bool, dpi: int, quiet: bool) -> None:
+def convert_pdf_file(
+    pdf_path: Path,
+    out_path: Path,
+    dpi: int,
+    pdf_format: str = "png",
+    show_progress: bool = True,
+) -> Tuple[float, float]:
+    """
+    Build out_path from a PDF, one page per slide, with slides sized like the
+    first page. Returns that slide size in inches.
+    """
+    # One open for both; the render batches then open the document themselves
+    page_count, (w_in, h_in) = pdf_page_count_and_size(pdf_path)
+    # Pages are rendered while slides are assembled; the page progress bar is
+    # also the slide progress bar
+    pages = stream_pdf_pages(pdf_path, dpi, pdf_format, show_progress, page_count)
+    build_presentation([], out_path, w_in, h_in, "fit", pdf_pages=pages)
+    return w_in, h_in
+
+
+def iter_pdf_pages(
+    pdfs: Sequence[Tuple[Path, Optional[Path]]], dpi: int, fmt: str = "png"
+) -> Iterator[ImageSource]:
+    """
+    Yield the pages of several PDFs in order, rendering them as they are consumed.
+
+    Each PDF comes with an optional page dir. Without one, pages are rendered in
+    memory. A page dir that already holds pages (an earlier render, e.g. from a
+    cache) is used as is; an empty one is rendered into, so the caller can keep
+    the pages afterwards. A PDF listed more than once is rendered only the first
+    time; later copies replay the same pages.
+    """
+    counts = Counter(pdf_path for pdf_path, _ in pdfs)
+    replays: Dict[Path, List[ImageSource]] = {}
+    for pdf_path, page_dir in pdfs:
+        if pdf_path in replays:
+            yield from replays[pdf_path]
+            continue
+        rendered = sorted(page_dir.iterdir()) if page_dir is not None else []
+        pages = rendered or iter_pdf_images(pdf_path, dpi, page_dir, fmt=fmt)
+        if counts[pdf_path] == 1:
+            yield from pages
+            continue
+        # Kept for the later copies; in-memory pages cost nothing extra, as the
+        # deck's image part holds the very same bytes
+        kept: List[ImageSource] = replays.setdefault(pdf_path, [])
+        for page in pages:
+            kept.append(page)
+            yield page
+
+
+def build_presentation_from_pdfs(
+    pdfs: Sequence[Tuple[Path, Optional[Path]]],
+    images: Sequence[ImageSource],
+    output_path: Path,
+    slide_width_in: float,
+    slide_height_in: float,
+    mode: str,
+    dpi: int,
+    pdf_format: str = "png",
+    slide_width_emu: Optional[int] = None,
+    slide_height_emu: Optional[int] = None,
+    max_image_dpi: Optional[int] = None,
+) -> None:
+    """
+    Build one deck from the pages of `pdfs` (see iter_pdf_pages), then `images`.
+
+    Pages are rendered while slides are assembled, so rendering and building
+    overlap and no page list is ever materialized. All arguments are picklable,
+    so this can run in a worker process.
+    """
+    build_presentation(
+        images,
+        output_path,
+        slide_width_in,
+        slide_height_in,
+        mode,
+        slide_width_emu=slide_width_emu,
+        slide_height_emu=slide_height_emu,
+        max_image_dpi=max_image_dpi,
+        pdf_pages=iter_pdf_pages(pdfs, dpi, pdf_format),
+    )
+
+
+def process_folder(
+    folder: Path,
+    recursive: bool,
+    dpi: int,
+    quiet: bool,
+    max_image_dpi: Optional[int] = None,
+    pdf_format: str = "png",
+) -> None:
     """Process all PDFs and/or images in a folder into PPTX files."""
-    pdfs = sorted(folder.glob("*.pdf"))
-    imgs = [p for p in folder.iterdir() if p.suffix.lower() in ALLOWED_EXTS]
+    # One directory read per folder serves the PDF list, the image list and the
+    # recursion
+    pdfs, imgs, subdirs = scan_folder(folder)
 
-    # Recurse if requested
     if recursive:
-        for sub in folder.rglob("*"):
-            if sub.is_dir() and sub != folder:
-                process_folder(sub, recursive, dpi, quiet)
+        for sub in subdirs:
+            process_folder(sub, True, dpi, quiet, max_image_dpi, pdf_format)
 
     # If both PDFs and images exist — prioritize PDFs, warn user
     if pdfs and imgs:
@@ -393,21 +1265,16 @@ def process_folder(folder: Path, recursive: bool, dpi: int, quiet: bool) -> None
             out_name = item.stem + ".pptx"
             out_path = folder / out_name
             print(f"📄 Converting PDF → PPTX: {item.name} → {out_name}")
-            pages = convert_pdf_to_images(item, dpi=dpi)
-            w_in, h_in = pdf_first_page_size_inches(item)
-            build_presentation(pages, out_path, w_in, h_in, "fit", show_progress=True)
+            convert_pdf_file(item, out_path, dpi, pdf_format)
         else:
-            # Image folder
-            imgs = list_images(item if item.is_dir() else folder)
-            if not imgs:
-                continue
+            # Image folder (imgs is already this folder's sorted image list)
             out_name = folder.name + ".pptx"
             out_path = folder / out_name
             print(f"🖼️  Building PPTX from {len(imgs)} images → {out_name}")
 
             # Detect aspect ratio from first image
-            from PIL import Image
-
+            if imgs[0].suffix.lower() in HEIF_EXTS:
+                register_heif_opener()
             with Image.open(imgs[0]) as im:
                 w_in, h_in = (
                     im.width / 96,
@@ -417,7 +1284,62 @@ def process_folder(folder: Path, recursive: bool, dpi: int, quiet: bool) -> None
                 if w_in < h_in:
                     w_in, h_in = h_in, w_in
 
-            build_presentation(imgs, out_path, w_in, h_in, "fit", show_progress=True)
+            build_presentation(
+                imgs, out_path, w_in, h_in, "fit", show_progress=True, max_image_dpi=max_image_dpi
+            )
+
+
+def convert_pdf_jobs(jobs: List[Tuple[Path, Path]], args) -> None:
+    """
+    Run convert_pdf_file for each (pdf, output) pair from the CLI.
+
+    Several PDFs are converted in parallel, one per process (up to
+    CLI_PDF_WORKERS), each rendering its pages serially; a single PDF keeps the
+    in-process path and spreads its pages over the render workers instead.
+    """
+    workers = min(CLI_PDF_WORKERS, len(jobs))
+    if workers <= 1:
+        for path, out_path in jobs:
+            print(f"📄 [CLI] Converting PDF → PPTX: {path.name}")
+            try:
+                w_in, h_in = convert_pdf_file(
+                    path,
+                    out_path,
+                    args.dpi,
+                    args.pdf_image_format,
+                    show_progress=not args.quiet,
+                )
+                if not args.quiet:
+                    print(f'✅ Saved: {out_path} ({w_in:.2f}" × {h_in:.2f}")')
+            except Exception as e:
+                print(f"✗ Failed to process {path}: {e}")
+        return
+
+    # Spawned (not forked) workers: safe alongside threads, and on every platform
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = []
+        for path, out_path in jobs:
+            print(f"📄 [CLI] Converting PDF → PPTX: {path.name}")
+            futures.append(
+                executor.submit(
+                    convert_pdf_file,
+                    path,
+                    out_path,
+                    args.dpi,
+                    args.pdf_image_format,
+                    show_progress=False,  # Interleaved bars from several processes are noise
+                )
+            )
+        for (path, out_path), future in zip(jobs, futures):
+            try:
+                w_in, h_in = future.result()
+                if not args.quiet:
+                    print(f'✅ Saved: {out_path} ({w_in:.2f}" × {h_in:.2f}")')
+            except Exception as e:
+                print(f"✗ Failed to process {path}: {e}")
 
 
 # ===[ MAIN ENTRYPOINT ]============================================
@@ -430,6 +1352,15 @@ def main():
     # Configure logging based on verbose flag
     if args.verbose:
         logging.basicConfig(level=logging.DEBUG, format="%(levelname)s: %(message)s")
+        # Pillow-SIMD keeps the Pillow name; its versions carry a ".postN" suffix
+        logger.debug("Pillow %s (%s)", PIL.__version__, PIL.__file__)
+        # JPEG work is several times faster with libjpeg-turbo than plain libjpeg
+        try:
+            from PIL import features
+
+            logger.debug("libjpeg-turbo: %s", features.check_feature("libjpeg_turbo"))
+        except (ImportError, ValueError):  # Older Pillow (and Pillow-SIMD) builds
+            logger.debug("libjpeg-turbo: unknown")
     else:
         logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
 
@@ -449,8 +1380,9 @@ def main():
             sys.exit(1)
 
         out_name = prompt_output_name(default_name="slides")
-        if in_path.is_dir():
-            output_path = (in_path / out_name).resolve()
+        # in_path is already resolved, and "folder" means it is a directory
+        if kind == "folder":
+            output_path = in_path / out_name
         else:
             # Use --output if provided, otherwise use input name
             if args.output:
@@ -473,20 +1405,16 @@ def main():
         print(f"  Placement : {placement}")
         print(f"  Output file: {output_path}\n")
 
-        temp_dir = None
         try:
             if kind == "pdf":
-                pages = convert_pdf_to_images(in_path, dpi=args.dpi)
-                # Store temp dir for cleanup
-                if pages:
-                    temp_dir = pages[0].parent
+                pages = stream_pdf_pages(in_path, dpi=args.dpi, fmt=args.pdf_image_format)
                 build_presentation(
-                    images=pages,
+                    images=[],
                     output_path=output_path,
                     slide_width_in=width_in,
                     slide_height_in=height_in,
                     mode=mode,
-                    show_progress=True,
+                    pdf_pages=pages,
                 )
             else:
                 images = list_images(in_path)
@@ -500,90 +1428,64 @@ def main():
                     slide_height_in=height_in,
                     mode=mode,
                     show_progress=True,
+                    max_image_dpi=args.max_image_dpi,
                 )
         except Exception as e:
             print(f"✗ Failed to create presentation: {e}")
             sys.exit(1)
-        finally:
-            # Clean up temporary PDF conversion files
-            if temp_dir and temp_dir.exists():
-                import shutil
-
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception:
-                    pass  # Best effort cleanup
 
         print(f"✅ Presentation saved to: {output_path}")
         return
 
-    # Non-interactive CLI mode
+    # Non-interactive CLI mode. Folders are built as they come; PDFs are queued
+    # (after any overwrite prompt) and converted together at the end
+    pdf_jobs: List[Tuple[Path, Path]] = []
     for path_str in args.input:
         path = Path(path_str).expanduser().resolve()
 
-        if not path.exists():
+        kind = detect_input_type(path)
+        # Only an unusable path needs the extra existence check
+        if kind == "unknown" and not path.exists():
             print(f"✗ Input not found: {path}")
             continue
 
-        kind = detect_input_type(path)
-
         if kind == "pdf":
-            print(f"📄 [CLI] Converting PDF → PPTX: {path.name}")
-            temp_dir = None
-            try:
-                pages = convert_pdf_to_images(path, dpi=args.dpi)
-                if pages:
-                    temp_dir = pages[0].parent
-
-                # Determine output name
-                if args.output:
-                    out_name = args.output
-                    if not out_name.lower().endswith(".pptx"):
-                        out_name = out_name + ".pptx"
-                else:
-                    out_name = path.stem + ".pptx"
-
-                out_path = path.parent / out_name
-
-                # 🔒 Overwrite protection
-                w_in, h_in = pdf_first_page_size_inches(path)
-                if confirm_overwrite(out_path, quiet=args.quiet, force=args.force):
-                    build_presentation(
-                        pages,
-                        output_path=out_path,
-                        slide_width_in=w_in,
-                        slide_height_in=h_in,
-                        mode="fit",
-                        show_progress=not args.quiet,
-                    )
-                    if not args.quiet:
-                        print(f'✅ Saved: {out_path} ({w_in:.2f}" × {h_in:.2f}")')
-                else:
-                    print(f"⏩ Skipped (already exists): {out_path}")
+            # Determine output name
+            if args.output:
+                out_name = args.output
+                if not out_name.lower().endswith(".pptx"):
+                    out_name = out_name + ".pptx"
+            else:
+                out_name = path.stem + ".pptx"
 
-            except Exception as e:
-                print(f"✗ Failed to process {path}: {e}")
-            finally:
-                # Clean up temp files
-                if temp_dir and temp_dir.exists():
-                    import shutil
+            out_path = path.parent / out_name
 
-                    try:
-                        shutil.rmtree(temp_dir)
-                    except Exception:
-                        pass
+            # 🔒 Overwrite protection
+            if confirm_overwrite(out_path, quiet=args.quiet, force=args.force):
+                pdf_jobs.append((path, out_path))
+            else:
+                print(f"⏩ Skipped (already exists): {out_path}")
 
         elif kind == "folder":
             if not args.quiet:
                 print(f"🗂️  [CLI] Processing folder: {path}")
             try:
-                process_folder(path, recursive=args.recursive, dpi=args.dpi, quiet=args.quiet)
+                process_folder(
+                    path,
+                    recursive=args.recursive,
+                    dpi=args.dpi,
+                    quiet=args.quiet,
+                    max_image_dpi=args.max_image_dpi,
+                    pdf_format=args.pdf_image_format,
+                )
             except Exception as e:
                 print(f"✗ Folder failed: {path} ({e})")
 
         else:
             print(f"✗ Unsupported input: {path}")
 
+    convert_pdf_jobs(pdf_jobs, args)
+
     if not args.quiet:
         print("\n✅ CLI execution complete.")
 
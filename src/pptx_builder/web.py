@@ -4,24 +4,40 @@ Gradio Web UI for PPTX Builder
 Simple interface for converting PDFs and images to PowerPoint
 """
 
-import gradio as gr
+import asyncio
+import functools
+import hashlib
 import logging
+import mmap
+import multiprocessing
+import os
+import re
 import tempfile
 import shutil
+import threading
 import atexit
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 import time
+import uuid
+import weakref
 
 from .core import (
-    build_presentation,
-    convert_pdf_to_images,
+    EMU_PER_INCH,
+    build_presentation_from_pdfs,
     pdf_first_page_size_inches,
+    pdf_page_count,
 )
 
 # Set up module logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+# Level comes from $LOG_LEVEL (e.g. DEBUG); %-style args below are only
+# formatted when a record actually passes the level filter
+logging.basicConfig(
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(levelname)s: %(message)s"
+)
 
 # Slide size options for dropdown
 SLIDE_SIZE_OPTIONS = {
@@ -32,46 +48,374 @@ SLIDE_SIZE_OPTIONS = {
     'Legal (14" x 8.5")': (14.0, 8.5),
     'Tabloid (17" x 11")': (17.0, 11.0),
 }
+# "Auto" gives a single PDF slides matching its first page and anything else the
+# fallback preset; every other choice is explicit and used as is
+AUTO_SLIDE_SIZE = "Auto (match PDF)"
+AUTO_FALLBACK_SLIDE_SIZE = "16:9 (Widescreen)"
+SLIDE_SIZE_CHOICES = [AUTO_SLIDE_SIZE] + list(SLIDE_SIZE_OPTIONS)
+DEFAULT_SLIDE_SIZE = AUTO_SLIDE_SIZE
+
+# Same presets in EMU, computed once so requests skip the inch conversion
+SLIDE_SIZE_OPTIONS_EMU = {
+    name: (int(round(w * EMU_PER_INCH)), int(round(h * EMU_PER_INCH)))
+    for name, (w, h) in SLIDE_SIZE_OPTIONS.items()
+}
+
+# Quality tiers: label -> (PDF conversion DPI, page image format). "auto" saves
+# photographic/scanned pages as JPEG and keeps text and diagrams lossless PNG
+QUALITY_PRESETS = {
+    "Preview (100 DPI, JPEG)": (100, "jpeg"),
+    "Standard (150 DPI)": (150, "auto"),
+    "Print (300 DPI)": (300, "auto"),
+}
+QUALITY_CHOICES = list(QUALITY_PRESETS)
+DEFAULT_QUALITY = "Standard (150 DPI)"
+
+# PDF DPI slider range; above 300 DPI pages cost 4x+ the pixels of 150 DPI with no
+# visible gain on screen, so higher values need the high-DPI checkbox
+DPI_SLIDER_MAX = 300
+HIGH_DPI_SLIDER_MAX = 600
+
+# Digit runs in filenames, compared numerically when sorting uploads
+DIGITS_RE = re.compile(r"(\d+)")
 
 # Security limits
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB per file
 MAX_FILES = 100  # Max 100 files per upload
+MAX_QUEUE_SIZE = 20  # Max jobs waiting in the Gradio queue
+# Worker processes in the pool (see get_executor). A job renders its PDFs and
+# assembles its deck in one worker, pages one after another, so jobs (not pages)
+# are what spread over the cores
+POOL_WORKERS = os.cpu_count() or 1
+# Jobs running at once: one per worker, so every core can be busy; a job beyond
+# that would only wait for a free worker while holding a queue slot
+MAX_CONCURRENT_JOBS = POOL_WORKERS
+
+# Gradio serves files that already live in its cache dir without copying them,
+# so per-request dirs are created there (same lookup as gradio.utils.get_upload_folder)
+TEMP_ROOT = Path(os.environ.get("GRADIO_TEMP_DIR") or Path(tempfile.gettempdir()) / "gradio")
+
+# Temp dirs older than this are swept (seconds)
+MAX_TEMP_AGE = 3600
+JANITOR_INTERVAL = 600
+
+# App-scoped root for this process; every request gets its own dir inside it,
+# and the whole root is removed at exit. Created on first use (see
+# ensure_app_temp_root), not at import: pool workers re-import this module.
+# The name carries the owning PID, so a later start can tell a live server's
+# (possibly long idle) root from one left by a server that was killed
+APP_ROOT_PREFIX = "pptx_builder_root_"
+APP_TEMP_ROOT = TEMP_ROOT / f"{APP_ROOT_PREFIX}{os.getpid()}_{uuid.uuid4().hex}"
+APP_TEMP_ROOT_CREATED = False
+
+# Opt-in cache of rendered PDF pages shared across requests, one dir per
+# (content digest, DPI, format), so a resubmitted PDF skips conversion. Off by
+# default: it keeps users' pages after their session ends. When enabled
+# ($PPTX_RENDER_CACHE=1) it lives inside APP_TEMP_ROOT, so it is private to this
+# process, expires like the request dirs, and is deleted at exit; being on the
+# same filesystem as the request dirs, pages are hardlinked rather than copied
+RENDER_CACHE_ENABLED = os.environ.get("PPTX_RENDER_CACHE", "").lower() in ("1", "true", "yes")
+RENDER_CACHE_ROOT = APP_TEMP_ROOT / "render_cache"
+RENDER_CACHE_MAX_AGE = MAX_TEMP_AGE  # Entries untouched this long are dropped (seconds)
+RENDER_CACHE_MAX_ENTRIES = 50  # Least recently used entries beyond this are dropped
+
+# First-page sizes (inches) of recently seen PDFs, by content digest, so a
+# resubmitted PDF skips the open; least recently used beyond the cap are dropped.
+# Only touched from the event loop thread.
+PDF_SIZE_CACHE: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+PDF_SIZE_CACHE_MAX_ENTRIES = 128
+
+# Background sweeper for APP_TEMP_ROOT, started on the first request
+JANITOR: Optional["asyncio.Task[None]"] = None
+
+# Worker processes for PDF rasterization and PPTX assembly, so heavy jobs
+# never block the event loop or serialize behind the GIL. Never forked straight
+# from the server: a fork copies locks held by the server's other threads, which
+# can deadlock the child. forkserver forks them from a clean single-threaded
+# process instead (spawn where it is unavailable, e.g. Windows)
+EXECUTOR_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+# The pool is created on the first request: the forkserver re-imports this
+# module, and must not start a pool of its own
+EXECUTOR: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the worker pool, starting it on first use (event loop thread only)."""
+    global EXECUTOR
+    if EXECUTOR is None:
+        EXECUTOR = ProcessPoolExecutor(
+            max_workers=POOL_WORKERS,
+            mp_context=multiprocessing.get_context(EXECUTOR_START_METHOD),
+        )
+    return EXECUTOR
 
-# Track temp directories for cleanup
-TEMP_DIRS: List[Path] = []
 
+def natural_sort_key(name: str) -> Tuple:
+    """
+    Case-insensitive sort key that orders numbers numerically (page2 before page10).
 
-def cleanup_temp_files():
-    """Clean up all temporary directories on exit."""
-    for temp_dir in TEMP_DIRS:
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir, ignore_errors=True)
-    TEMP_DIRS.clear()
+    The extension is compared last, so scan.png still sorts before scan1.png.
+    """
+    stem, ext = os.path.splitext(name.lower())
+    parts: list = DIGITS_RE.split(stem)
+    # split() with a capture group puts the digit runs at the odd indexes
+    parts[1::2] = [int(run) for run in parts[1::2]]
+    return tuple(parts), ext
 
 
-def cleanup_old_files():
-    """Remove temp directories older than 1 hour."""
-    temp_base = Path(tempfile.gettempdir())
+def inspect_upload(path: str) -> Tuple[int, str]:
+    """
+    Return (size, SHA-256 hex digest) of an upload from a single open + fstat.
+
+    Hashing goes through mmap (no read buffers). Files over MAX_FILE_SIZE are
+    about to be rejected, so they are not hashed and get an empty digest.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return size, hashlib.sha256().hexdigest()
+        if size > MAX_FILE_SIZE:
+            return size, ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return size, hashlib.sha256(mm).hexdigest()
+
+
+def remove_temp_dir(path: str) -> None:
+    """Delete a temp directory tree (best effort; missing dirs are fine)."""
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def remove_temp_dir_in_background(path: str) -> None:
+    """Hand remove_temp_dir to a daemon thread so the caller never waits on the disk."""
+    threading.Thread(
+        target=remove_temp_dir, args=(path,), name="remove-temp-dir", daemon=True
+    ).start()
+
+
+class Job:
+    """
+    One request's temp dir, removed as soon as the Job is garbage collected.
+
+    process_files hands the Job back into the session's gr.State, so the dir lives
+    exactly as long as the user's session still references the download.
+    The Job is usually collected on the event loop thread, so the tree is deleted
+    in the background; at exit cleanup_temp_files removes whatever is left.
+    """
+
+    def __init__(self, temp_dir: Path):
+        self.temp_dir = temp_dir
+        self._finalizer = weakref.finalize(self, remove_temp_dir_in_background, str(temp_dir))
+        self._finalizer.atexit = False
+
+
+def remove_old_dirs(root: Path, prefix: str = "") -> None:
+    """Remove subdirectories of root (optionally name-filtered) older than MAX_TEMP_AGE."""
+    if not root.is_dir():
+        return
     current_time = time.time()
 
-    for item in temp_base.glob("pptx_builder_*"):
-        if item.is_dir():
-            # Remove if older than 1 hour
-            if current_time - item.stat().st_mtime > 3600:
-                shutil.rmtree(item, ignore_errors=True)
+    # scandir hands back type info with each entry, so only matches get a stat call
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if not entry.name.startswith(prefix):
+                continue
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue  # Removed meanwhile (e.g. by a Job finalizer)
+            if current_time - mtime > MAX_TEMP_AGE:
+                remove_temp_dir(entry.path)
+
+
+def root_owner_gone(name: str) -> bool:
+    """
+    Whether the server process that owns the temp root `name` has exited.
 
+    Only a root whose PID is known not to be running counts as gone: foreign
+    names, this process, and (on Windows, where os.kill would terminate it)
+    every other process are treated as alive.
+    """
+    pid_text = name[len(APP_ROOT_PREFIX) :].split("_", 1)[0]
+    if not pid_text.isdigit() or int(pid_text) == os.getpid() or os.name == "nt":
+        return False
+    try:
+        os.kill(int(pid_text), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass  # e.g. EPERM: running, as another user
+    return False
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Hardlink src to dst, falling back to a copy across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def load_cached_pages(key: str, dest_root: Path, pdf_path: Path) -> Optional[List[Path]]:
+    """
+    Link a cached render of pdf_path into a fresh dir under dest_root and return
+    its pages.
+
+    Returns None on a cache miss, including an entry whose page count does not
+    match the PDF (which is dropped). Linking (rather than using the cache files
+    directly) keeps the request's pages alive even if the entry is evicted mid-build.
+    """
+    cache_dir = RENDER_CACHE_ROOT / key
+    try:
+        names = sorted(os.listdir(cache_dir))
+    except OSError:
+        return None  # Not cached
+    if len(names) != pdf_page_count(pdf_path):
+        logger.warning("Dropping render cache entry %s: page count mismatch", key)
+        discard_cache_entry(cache_dir)
+        return None
+    try:
+        os.utime(cache_dir)  # Directory mtime is the LRU clock
+        dest = Path(tempfile.mkdtemp(prefix="pptx_pdf_", dir=dest_root))
+        for name in names:
+            link_or_copy(cache_dir / name, dest / name)
+    except OSError:
+        # Evicted while we were reading it: eviction renames the entry away
+        # before deleting anything, so this never yields a partial page list
+        return None
+    return [dest / name for name in names]
 
-# Register cleanup on exit
-atexit.register(cleanup_temp_files)
 
+def store_cached_pages(key: str, pages: List[Path]) -> None:
+    """Publish a fresh render under key (atomically), then trim the cache."""
+    staging = Path(tempfile.mkdtemp(prefix=".staging_", dir=RENDER_CACHE_ROOT))
+    try:
+        for page in pages:
+            link_or_copy(page, staging / page.name)
+        os.rename(staging, RENDER_CACHE_ROOT / key)
+    except OSError:
+        # Another request stored the same key first; its copy is identical
+        shutil.rmtree(staging, ignore_errors=True)
+    evict_render_cache()
+
+
+def discard_cache_entry(path: Path) -> None:
+    """
+    Remove a render cache entry without ever exposing a half-deleted page list.
+
+    The entry is first renamed to a hidden tombstone (atomic), so a concurrent
+    load_cached_pages either sees every page or no entry at all.
+    """
+    tombstone = RENDER_CACHE_ROOT / f".evicted_{path.name}_{uuid.uuid4().hex}"
+    try:
+        os.rename(path, tombstone)
+    except OSError:
+        return  # Already discarded by someone else
+    remove_temp_dir(str(tombstone))
 
-def process_files(
+
+def evict_render_cache() -> None:
+    """Drop cache entries past RENDER_CACHE_MAX_AGE, then the oldest beyond the cap."""
+    current_time = time.time()
+    live = []
+    try:
+        entries = os.scandir(RENDER_CACHE_ROOT)
+    except FileNotFoundError:
+        return  # Not created yet (no request so far)
+    with entries:
+        for entry in entries:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue  # Discarded meanwhile by another request
+            if entry.name.startswith("."):
+                # Staging dirs and tombstones are never read; only stale ones
+                # (left by a crash) are swept here
+                if current_time - mtime > RENDER_CACHE_MAX_AGE:
+                    remove_temp_dir(entry.path)
+            elif current_time - mtime > RENDER_CACHE_MAX_AGE:
+                discard_cache_entry(Path(entry.path))
+            else:
+                live.append((mtime, entry.path))
+    live.sort(reverse=True)
+    for _, path in live[RENDER_CACHE_MAX_ENTRIES:]:
+        discard_cache_entry(Path(path))
+
+
+def cleanup_temp_files():
+    """Clean up this process's temp root on exit."""
+    remove_temp_dir(str(APP_TEMP_ROOT))
+
+
+def ensure_app_temp_root() -> None:
+    """Create this process's temp root (and render cache dir), registering its exit cleanup."""
+    global APP_TEMP_ROOT_CREATED
+    if not APP_TEMP_ROOT_CREATED:
+        atexit.register(cleanup_temp_files)
+        APP_TEMP_ROOT_CREATED = True
+    TEMP_ROOT.mkdir(parents=True, exist_ok=True)
+    APP_TEMP_ROOT.mkdir(mode=0o700, exist_ok=True)
+    if RENDER_CACHE_ENABLED:
+        RENDER_CACHE_ROOT.mkdir(exist_ok=True)
+
+
+def cleanup_old_files():
+    """
+    Sweep what earlier runs left in TEMP_ROOT (once, at startup).
+
+    Roots of servers that are no longer running (e.g. killed before their exit
+    cleanup) are removed whatever their age; a live server's root never is,
+    however long it has been idle. Request dirs made directly in TEMP_ROOT by
+    versions without a root are removed once older than 1 hour.
+    """
+    if not TEMP_ROOT.is_dir():
+        return
+    current_time = time.time()
+    with os.scandir(TEMP_ROOT) as entries:
+        for entry in entries:
+            if not entry.name.startswith("pptx_builder_"):
+                continue
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                if entry.name.startswith(APP_ROOT_PREFIX):
+                    stale = root_owner_gone(entry.name)
+                else:
+                    age = current_time - entry.stat(follow_symlinks=False).st_mtime
+                    stale = age > MAX_TEMP_AGE
+            except OSError:
+                continue  # Removed meanwhile
+            if stale:
+                remove_temp_dir(entry.path)
+
+
+async def janitor():
+    """Periodically sweep expired request dirs and render cache entries."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(JANITOR_INTERVAL)
+        # One failed sweep must not end the task: it is started only once
+        try:
+            await loop.run_in_executor(None, remove_old_dirs, APP_TEMP_ROOT, "pptx_builder_")
+            if RENDER_CACHE_ENABLED:
+                await loop.run_in_executor(None, evict_render_cache)
+        except Exception:
+            logger.exception("Temp dir sweep failed; retrying in %d s", JANITOR_INTERVAL)
+
+
+async def process_files(
     files: List[str],
     slide_size: str,
     fit_mode: str,
     dpi: int = 150,
     output_name: str = "",
-) -> Optional[str]:
+    quality: str = DEFAULT_QUALITY,
+) -> Tuple[Optional[str], Optional[Job]]:
     """
     Process uploaded files and create PowerPoint presentation.
 
@@ -81,69 +425,134 @@ def process_files(
         fit_mode: "Fit whole image" or "Crop to fill"
         dpi: DPI for PDF conversion
         output_name: Custom output filename (optional)
+        quality: Selected quality tier (picks the PDF page image format)
 
     Returns:
-        Path to generated PPTX file or None on error
+        (path to generated PPTX file or None, Job owning the request's temp dir)
     """
-    if not files:
-        return None
+    import gradio as gr  # Already loaded by the UI; see build_app
 
-    logger.debug(f"Processing {len(files)} file(s)")
+    if not files:
+        return None, None
+
+    # Gradio's API advertises the slider as a float; renders and cache keys use ints
+    dpi = int(round(dpi))
+    logger.debug("Processing %d file(s)", len(files))
+    if dpi > DPI_SLIDER_MAX:
+        logger.warning(
+            "Rendering PDFs at %d DPI: memory and time grow with DPI squared "
+            "(%.0fx the pixels of 150 DPI)",
+            dpi,
+            (dpi / 150) ** 2,
+        )
 
     # Security: Limit number of files
     if len(files) > MAX_FILES:
         raise gr.Error(f"Too many files. Maximum {MAX_FILES} files allowed.")
 
-    # Security: Check file sizes
-    for file in files:
-        logger.debug(f"Checking file: {file}")
-        file_path = Path(file)
-        if file_path.exists() and file_path.stat().st_size > MAX_FILE_SIZE:
-            raise gr.Error(f"File too large: {file_path.name}. Maximum 50MB per file.")
+    # Security: Check file sizes. One batch of off-loop calls stats and hashes
+    # every upload; the digests are reused below to skip duplicate work.
+    loop = asyncio.get_running_loop()
+    infos = await asyncio.gather(
+        *(loop.run_in_executor(None, inspect_upload, file) for file in files),
+        return_exceptions=True,
+    )
+
+    # Same pass: split uploads into PDFs (need conversion) and direct image files;
+    # byte-identical uploads are converted/embedded only once. Uploads stay
+    # strings; a Path is only built for the first copy of each content
+    digests = []
+    first_by_digest: Dict[str, Path] = {}
+    pdf_digests = []
+    image_uploads = []
+    for file, info in zip(files, infos):
+        logger.debug("Checking file: %s", file)
+        if isinstance(info, FileNotFoundError):
+            raise gr.Error(f"File not found: {Path(file).name}")
+        if isinstance(info, BaseException):
+            raise info
+        size, digest = info
+        if size > MAX_FILE_SIZE:
+            raise gr.Error(f"File too large: {Path(file).name}. Maximum 50MB per file.")
+        digests.append(digest)
+        if digest not in first_by_digest:
+            first_by_digest[digest] = Path(file)
+        if file.lower().endswith(".pdf"):
+            pdf_digests.append(digest)
+        else:
+            image_uploads.append((os.path.basename(file), digest))
+    single_pdf = len(files) == 1 and bool(pdf_digests)
+
+    # Start the temp-dir sweeper on the running event loop
+    global JANITOR
+    if JANITOR is None:
+        JANITOR = asyncio.ensure_future(janitor())
 
     # Create temp directory for processing
-    temp_dir = Path(tempfile.mkdtemp(prefix="pptx_builder_"))
-    TEMP_DIRS.append(temp_dir)
-    logger.debug(f"Created temp dir: {temp_dir}")
+    ensure_app_temp_root()
+    job = Job(Path(tempfile.mkdtemp(prefix="pptx_builder_", dir=APP_TEMP_ROOT)))
+    temp_dir = job.temp_dir
+    logger.debug("Created temp dir: %s", temp_dir)
 
     try:
         # Get slide dimensions
-        width_in, height_in = SLIDE_SIZE_OPTIONS[slide_size]
-
-        # Auto-detect aspect ratio for single PDF
-        if len(files) == 1 and Path(files[0]).suffix.lower() == ".pdf":
-            width_in, height_in = pdf_first_page_size_inches(Path(files[0]))
-            logger.debug(f"Auto-detected PDF aspect ratio: {width_in:.2f}x{height_in:.2f}")
-
-        mode = "fit" if fit_mode == "Fit whole image" else "fill"
-        logger.debug(f"Slide size: {width_in}x{height_in}, mode: {mode}")
-
-        image_files = []
-
-        # Process each uploaded file
-        for file in files:
-            file_path = Path(file)
-            logger.debug(f"Processing file: {file_path}")
-
-            # Handle PDFs
-            if file_path.suffix.lower() == ".pdf":
-                logger.debug("Converting PDF at {} DPI".format(dpi))
-                # Convert PDF to images
-                pdf_images = convert_pdf_to_images(file_path, dpi=dpi)
-                logger.debug(f"Got {len(pdf_images)} images from PDF")
-                image_files.extend(pdf_images)
+        preset = AUTO_FALLBACK_SLIDE_SIZE if slide_size == AUTO_SLIDE_SIZE else slide_size
+        width_in, height_in = SLIDE_SIZE_OPTIONS[preset]
+        width_emu, height_emu = SLIDE_SIZE_OPTIONS_EMU[preset]
+
+        # Auto-detect aspect ratio for single PDF (only with "Auto", so an
+        # explicit preset never costs a PDF open)
+        if single_pdf and slide_size == AUTO_SLIDE_SIZE:
+            cached_size = PDF_SIZE_CACHE.get(digests[0])
+            if cached_size is None:
+                cached_size = await loop.run_in_executor(
+                    None, pdf_first_page_size_inches, Path(files[0])
+                )
+                PDF_SIZE_CACHE[digests[0]] = cached_size
+                if len(PDF_SIZE_CACHE) > PDF_SIZE_CACHE_MAX_ENTRIES:
+                    PDF_SIZE_CACHE.popitem(last=False)
             else:
-                # Direct image files
-                logger.debug("Adding image file directly")
-                image_files.append(file_path)
+                PDF_SIZE_CACHE.move_to_end(digests[0])
+            width_in, height_in = cached_size
+            width_emu, height_emu = int(width_in * EMU_PER_INCH), int(height_in * EMU_PER_INCH)
+            logger.debug("Auto-detected PDF aspect ratio: %.2fx%.2f", width_in, height_in)
 
-        if not image_files:
-            logger.debug("No image files to process")
-            return None
-
-        # Sort images
-        image_files.sort(key=lambda p: p.name.lower())
-        logger.debug(f"Total images: {len(image_files)}")
+        mode = "fit" if fit_mode == "Fit whole image" else "fill"
+        _, pdf_fmt = QUALITY_PRESETS.get(quality, QUALITY_PRESETS[DEFAULT_QUALITY])
+        logger.debug("Slide size: %sx%s, mode: %s", width_in, height_in, mode)
+
+        # Sort direct image uploads by name with numbers in numeric order (PDF pages
+        # already arrive in page order), then point duplicates at the first path
+        # seen with the same digest
+        image_uploads.sort(key=lambda item: natural_sort_key(item[0]))
+        image_files = [first_by_digest[digest] for _, digest in image_uploads]
+
+        # PDF pages are rendered in the build worker while slides are assembled:
+        # in memory by default, or, with the render cache, into a page dir that
+        # is stored afterwards (a cache hit supplies an already-filled dir).
+        # A PDF uploaded twice is rendered once and its pages replayed
+        page_dirs: Dict[str, Optional[Path]] = dict.fromkeys(pdf_digests)
+        misses: Dict[str, Path] = {}
+        if RENDER_CACHE_ENABLED:
+            for digest in page_dirs:
+                # Reuse an earlier render of the same bytes at the same settings
+                key = f"{digest}_{dpi}_{pdf_fmt}"
+                pages = await loop.run_in_executor(
+                    None, load_cached_pages, key, temp_dir, first_by_digest[digest]
+                )
+                if pages is not None:
+                    logger.debug("Render cache hit: %s", key)
+                    page_dirs[digest] = pages[0].parent if pages else None
+                else:
+                    page_dir = Path(tempfile.mkdtemp(prefix="pptx_pdf_", dir=temp_dir))
+                    page_dirs[digest] = misses[key] = page_dir
+        logger.debug(
+            "Building from %d PDF(s) at %d DPI as %s and %d image(s)",
+            len(page_dirs),
+            dpi,
+            pdf_fmt,
+            len(image_files),
+        )
 
         # Create output PPTX with appropriate name
         if output_name and output_name.strip():
@@ -153,32 +562,43 @@ def process_files(
                 output_filename = output_filename + ".pptx"
         elif len(files) == 1:
             # Single file: use input filename
-            first_file = Path(files[0])
-            output_filename = first_file.stem + ".pptx"
+            output_filename = Path(files[0]).stem + ".pptx"
         else:
             # Multiple files: use generic name
             output_filename = "presentation.pptx"
 
         output_path = temp_dir / output_filename
-        logger.debug(f"Building presentation: {output_path}")
-
-        build_presentation(
-            images=image_files,
-            output_path=output_path,
-            slide_width_in=width_in,
-            slide_height_in=height_in,
-            mode=mode,
-            show_progress=False,  # No terminal progress in web UI
+        logger.debug("Building presentation: %s", output_path)
+
+        await loop.run_in_executor(
+            get_executor(),
+            functools.partial(
+                build_presentation_from_pdfs,
+                # PDF pages go first (document order, never interleaved), then images
+                pdfs=[(first_by_digest[d], page_dirs[d]) for d in pdf_digests],
+                images=image_files,
+                output_path=output_path,
+                slide_width_in=width_in,
+                slide_height_in=height_in,
+                mode=mode,
+                dpi=dpi,
+                pdf_format=pdf_fmt,
+                slide_width_emu=width_emu,
+                slide_height_emu=height_emu,
+                # Uploaded images sharper than the chosen DPI are downscaled; PDF
+                # pages were rendered at that DPI and are embedded as they are
+                max_image_dpi=dpi,
+            ),
         )
+        for key, page_dir in misses.items():
+            pages = sorted(page_dir.iterdir())
+            await loop.run_in_executor(None, store_cached_pages, key, pages)
 
         logger.debug("Presentation created successfully")
-        return str(output_path)
+        return str(output_path), job
 
     except Exception as e:
-        import traceback
-
-        logger.error(f"Exception occurred: {e}")
-        logger.debug(f"Traceback:\n{traceback.format_exc()}")
+        logger.exception("Error processing files")
         raise gr.Error(f"Error: {str(e)}")
 
 
@@ -399,128 +819,176 @@ input:focus, textarea:focus, select:focus {
 }
 """
 
-# Create Gradio interface
-with gr.Blocks(title="PPTX Builder", theme=gr.themes.Default(primary_hue="red").set(body_background_fill="#0b0f19"), css=custom_css) as app:
-    # Header (70% width) with left/right split
-    gr.HTML("""
-    <div class="header-container">
-        <div class="logo-container">
-            <div class="logo-left">
-                <h1>PPTX Builder</h1>
-                <p>Convert PDFs and images to PowerPoint presentations</p>
-            </div>
-            <div class="cli-right">
-                <h3>Prefer CLI?</h3>
-                <code>pip install sageframe-pptx-builder</code>
+def build_app():
+    """
+    Build the Gradio UI.
+
+    Kept out of module import: pool workers re-import this module (as __mp_main__
+    under `python -m pptx_builder.web`), and must not load gradio or build a UI.
+    """
+    import gradio as gr
+
+    with gr.Blocks(title="PPTX Builder", theme=gr.themes.Default(primary_hue="red").set(body_background_fill="#0b0f19"), css=custom_css) as app:
+        # Header (70% width) with left/right split
+        gr.HTML("""
+        <div class="header-container">
+            <div class="logo-container">
+                <div class="logo-left">
+                    <h1>PPTX Builder</h1>
+                    <p>Convert PDFs and images to PowerPoint presentations</p>
+                </div>
+                <div class="cli-right">
+                    <h3>Prefer CLI?</h3>
+                    <code>pip install sageframe-pptx-builder</code>
+                </div>
             </div>
         </div>
-    </div>
-    """)
-
-    # Info box (70% width)
-    gr.HTML("""
-    <div class="info-box">
-        <div class="info-content">
-            <div class="info-item">
-                <strong>Private by design.</strong>
-                <span>Files are processed in-memory and automatically deleted. Nothing is stored or logged.</span>
-            </div>
-            <div class="info-item">
-                <strong>Open source.</strong>
-                <span>See the full code on GitHub.</span>
+        """)
+
+        # Info box (70% width)
+        gr.HTML("""
+        <div class="info-box">
+            <div class="info-content">
+                <div class="info-item">
+                    <strong>Private by design.</strong>
+                    <span>Files are processed in-memory and automatically deleted. Nothing is stored or logged.</span>
+                </div>
+                <div class="info-item">
+                    <strong>Open source.</strong>
+                    <span>See the full code on GitHub.</span>
+                </div>
             </div>
         </div>
-    </div>
-    """)
+        """)
 
-    # Main content column (70% width with background)
-    with gr.Column(elem_id="main-content"):
-        gr.Markdown("""
-            **Supported formats:** PDF, PNG, JPG, JPEG, TIFF, WebP, BMP, GIF, ICO, HEIC, HEIF
+        # Main content column (70% width with background)
+        with gr.Column(elem_id="main-content"):
+            gr.Markdown("""
+                **Supported formats:** PDF, PNG, JPG, JPEG, TIFF, WebP, BMP, GIF, ICO, HEIC, HEIF
+                """)
+
+            with gr.Row():
+                with gr.Column():
+                    files = gr.File(
+                        label="Upload PDF or Images",
+                        file_count="multiple",
+                        file_types=[
+                        ".pdf",
+                        ".png",
+                        ".jpg",
+                        ".jpeg",
+                        ".tif",
+                        ".tiff",
+                        ".webp",
+                        ".bmp",
+                        ".gif",
+                        ".ico",
+                        ".heic",
+                        ".heif",
+                    ],
+                    )
+
+                    slide_size = gr.Dropdown(
+                        choices=SLIDE_SIZE_CHOICES,
+                        value=DEFAULT_SLIDE_SIZE,
+                        label="Slide Size",
+                        info="Auto: a single PDF keeps its own page shape; anything else is 16:9",
+                    )
+
+                    fit_mode = gr.Radio(
+                        choices=["Fit whole image", "Crop to fill"],
+                        value="Fit whole image",
+                        label="Image Placement",
+                    )
+
+                    quality = gr.Radio(
+                        choices=QUALITY_CHOICES,
+                        value=DEFAULT_QUALITY,
+                        label="Quality",
+                    )
+
+                    dpi = gr.Slider(
+                        minimum=100,
+                        maximum=DPI_SLIDER_MAX,
+                        value=150,
+                        step=50,
+                        label="PDF Conversion DPI",
+                    )
+                    high_dpi = gr.Checkbox(label="High-DPI mode (slow)", value=False)
+
+                    # Unlock DPIs up to HIGH_DPI_SLIDER_MAX; turning it off clamps the value
+                    high_dpi.change(
+                        fn=lambda on, value: gr.update(
+                            maximum=HIGH_DPI_SLIDER_MAX if on else DPI_SLIDER_MAX,
+                            value=value if on else min(value, DPI_SLIDER_MAX),
+                        ),
+                        inputs=[high_dpi, dpi],
+                        outputs=dpi,
+                    )
+
+                    # Picking a tier moves the slider to that tier's DPI
+                    quality.change(
+                        fn=lambda tier: QUALITY_PRESETS[tier][0],
+                        inputs=quality,
+                        outputs=dpi,
+                    )
+
+                    output_name = gr.Textbox(
+                        label="Output Filename (optional)",
+                        placeholder="Leave empty to use input filename",
+                        value="",
+                    )
+
+                    submit_btn = gr.Button("Create Presentation", variant="primary")
+
+                with gr.Column():
+                    output = gr.File(label="Download PPTX")
+                    job_state = gr.State()
+
+                    gr.Markdown("""
+                        ### How it works:
+                        1. Upload one or more PDFs or images
+                        2. Choose slide size and placement mode
+                        3. Click "Create Presentation"
+                        4. Download your PPTX file
+
+                        **Note:** Temp files are cleaned up automatically after 1 hour.
+                        """)
+
+            # Connect interface
+            submit_btn.click(
+                fn=process_files,
+                inputs=[files, slide_size, fit_mode, dpi, output_name, quality],
+                outputs=[output, job_state],
+            )
+
+        # Footer with branding (70% width)
+        gr.HTML("""
+            <div class="footer-container">
+                <div class="footer">
+                    <p>
+                        Created by Andrew T. Marcus |
+                        <a href="https://github.com/sageframe-no-kaji/pptx-builder" \
+target="_blank">View source on GitHub</a>
+                    </p>
+                </div>
+            </div>
             """)
 
-        with gr.Row():
-            with gr.Column():
-                files = gr.File(
-                    label="Upload PDF or Images",
-                    file_count="multiple",
-                    file_types=[
-                    ".pdf",
-                    ".png",
-                    ".jpg",
-                    ".jpeg",
-                    ".tif",
-                    ".tiff",
-                    ".webp",
-                    ".bmp",
-                    ".gif",
-                    ".ico",
-                    ".heic",
-                    ".heif",
-                ],
-                )
-
-                slide_size = gr.Dropdown(
-                    choices=list(SLIDE_SIZE_OPTIONS.keys()),
-                    value="16:9 (Widescreen)",
-                    label="Slide Size",
-                )
-
-                fit_mode = gr.Radio(
-                    choices=["Fit whole image", "Crop to fill"],
-                    value="Fit whole image",
-                    label="Image Placement",
-                )
-
-                dpi = gr.Slider(
-                    minimum=150, maximum=600, value=150, step=50, label="PDF Conversion DPI"
-                )
-
-                output_name = gr.Textbox(
-                    label="Output Filename (optional)",
-                    placeholder="Leave empty to use input filename",
-                    value="",
-                )
-
-                submit_btn = gr.Button("Create Presentation", variant="primary")
-
-            with gr.Column():
-                output = gr.File(label="Download PPTX")
-
-                gr.Markdown("""
-                    ### How it works:
-                    1. Upload one or more PDFs or images
-                    2. Choose slide size and placement mode
-                    3. Click "Create Presentation"
-                    4. Download your PPTX file
-
-                    **Note:** Temp files are cleaned up automatically after 1 hour.
-                    """)
+    # Run up to MAX_CONCURRENT_JOBS at once; reject new jobs once MAX_QUEUE_SIZE are waiting
+    app.queue(default_concurrency_limit=MAX_CONCURRENT_JOBS, max_size=MAX_QUEUE_SIZE)
+    return app
 
-        # Connect interface
-        submit_btn.click(
-            fn=process_files,
-            inputs=[files, slide_size, fit_mode, dpi, output_name],
-            outputs=output,
-        )
-
-    # Footer with branding (70% width)
-    gr.HTML("""
-        <div class="footer-container">
-            <div class="footer">
-                <p>
-                    Created by Andrew T. Marcus |
-                    <a href="https://github.com/sageframe-no-kaji/pptx-builder" \
-target="_blank">View source on GitHub</a>
-                </p>
-            </div>
-        </div>
-        """)
 
 if __name__ == "__main__":
-    # Clean up old files on startup
-    cleanup_old_files()
-
+    # Clean up old files on startup, in the background: a crowded temp dir
+    # should not hold up launch
+    threading.Thread(target=cleanup_old_files, name="startup-cleanup", daemon=True).start()
+    # Start the worker pool (and its forkserver) before serving, so the first
+    # request does not wait for workers to start
+    get_executor().submit(int).result()
+
+    app = build_app()
     app.launch(
         server_name="0.0.0.0",
         server_port=7860,
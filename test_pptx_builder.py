@@ -1,22 +1,40 @@
 """
-Tests for pptx_builder.core
+Tests for pptx_builder.core (and pptx_builder.web helpers, when gradio is installed)
 
 Run with: pytest test_pptx_builder.py
 """
 
+import os
+import time
 import pytest
+from pathlib import Path
 from pptx.util import Emu
 from pptx_builder.core import (
+    convert_pdf_to_images,
+    convert_pdf_to_streams,
     list_images,
     detect_input_type,
+    process_folder,
     confirm_overwrite,
     emu_to_float_inches,
     build_presentation,
+    picture_geometry,
     ALLOWED_EXTS,
     SLIDE_SIZES,
 )
 
 
+def make_pdf(path, pages):
+    """Write a PDF of 10" x 7.5" pages, each with distinct text, and return its path"""
+    import fitz
+
+    with fitz.open() as doc:
+        for i in range(pages):
+            doc.new_page(width=720, height=540).insert_text((72, 72), f"page {i + 1}")
+        doc.save(str(path))
+    return path
+
+
 class TestImageListing:
     """Test image file detection and listing"""
 
@@ -121,6 +139,110 @@ class TestAllowedExtensions:
         assert all(ext.islower() for ext in ALLOWED_EXTS)
 
 
+class TestFolderProcessing:
+    """Test batch folder processing"""
+
+    def test_recursive_processes_each_subfolder_once(self, tmp_path, monkeypatch):
+        """Nested folders should each be built exactly once"""
+        import pptx_builder.core as core
+        from PIL import Image
+
+        for sub in ["a", "a/b", "a/b/c"]:
+            (tmp_path / sub).mkdir(parents=True, exist_ok=True)
+            Image.new("RGB", (40, 30)).save(tmp_path / sub / "img.png")
+
+        built = []
+        monkeypatch.setattr(
+            core, "build_presentation", lambda images, out_path, *a, **kw: built.append(out_path)
+        )
+        process_folder(tmp_path, recursive=True, dpi=72, quiet=True)
+
+        assert sorted(built) == sorted(
+            tmp_path / sub / (Path(sub).name + ".pptx") for sub in ["a", "a/b", "a/b/c"]
+        )
+
+
+class TestPdfConversion:
+    """Test PDF rasterization"""
+
+    def test_convert_pdf_to_images_page_order(self, tmp_path):
+        """Should write one image per page, returned in page order"""
+        pdf = tmp_path / "doc.pdf"
+        make_pdf(pdf, 3)
+
+        pages = convert_pdf_to_images(pdf, dpi=20, temp_root=tmp_path)
+
+        assert [p.name for p in pages] == ["page_0001.png", "page_0002.png", "page_0003.png"]
+        assert all(p.exists() for p in pages)
+
+    def test_convert_pdf_to_streams_jpeg(self, tmp_path):
+        """Should return in-memory JPEGs sized by DPI"""
+        from PIL import Image
+
+        pdf = tmp_path / "doc.pdf"
+        make_pdf(pdf, 2)
+
+        streams = convert_pdf_to_streams(pdf, dpi=20, fmt="jpeg")
+
+        assert len(streams) == 2
+        with Image.open(streams[0]) as im:
+            assert im.format == "JPEG"
+            assert im.size == (200, 150)
+
+    def test_convert_pdf_to_streams_float_dpi(self, tmp_path):
+        """A float DPI (as sent through the web API) should be rounded, not rejected"""
+        from PIL import Image
+
+        pdf = tmp_path / "doc.pdf"
+        make_pdf(pdf, 1)
+
+        streams = convert_pdf_to_streams(pdf, dpi=20.4, fmt="png")
+
+        with Image.open(streams[0]) as im:
+            assert im.size == (200, 150)
+            assert im.info["dpi"] == pytest.approx((20, 20), abs=0.05)
+
+    @pytest.mark.parametrize("dpi", [20, 150])  # 150 counts colors on a downsampled sample
+    def test_convert_pdf_to_streams_auto_format(self, tmp_path, dpi):
+        """Should use JPEG for photographic pages and PNG for flat ones"""
+        import fitz
+        from PIL import Image
+
+        noise = tmp_path / "noise.png"
+        Image.frombytes("RGB", (200, 150), os.urandom(200 * 150 * 3)).save(noise)
+        pdf = tmp_path / "doc.pdf"
+        with fitz.open() as doc:
+            doc.new_page(width=720, height=540)
+            doc.new_page(width=720, height=540).insert_image(doc[1].rect, filename=str(noise))
+            doc.save(str(pdf))
+
+        streams = convert_pdf_to_streams(pdf, dpi=dpi, fmt="auto")
+
+        formats = []
+        for stream in streams:
+            with Image.open(stream) as im:
+                formats.append(im.format)
+        assert formats == ["PNG", "JPEG"]
+
+    def test_cli_converts_several_pdfs_in_parallel(self, tmp_path, monkeypatch):
+        """Each PDF given to the CLI should get its own PPTX, also across workers"""
+        import sys
+
+        import pptx_builder.core as core
+
+        pdfs = [tmp_path / "one.pdf", tmp_path / "two.pdf"]
+        for pdf in pdfs:
+            make_pdf(pdf, 2)
+
+        monkeypatch.setattr(core, "CLI_PDF_WORKERS", 2)
+        monkeypatch.setattr(
+            sys, "argv", ["pptx-builder", "-i", *map(str, pdfs), "--dpi", "20", "--quiet"]
+        )
+        core.main()
+
+        assert all(pdf.with_suffix(".pptx").exists() for pdf in pdfs)
+
+
 # Integration test (requires PIL)
 class TestIntegration:
     """Integration tests requiring actual image processing"""
@@ -192,6 +314,11 @@ class TestUtilities:
         assert abs(emu_to_float_inches(Emu(1828800)) - 2.0) < 0.001
         assert abs(emu_to_float_inches(Emu(0)) - 0.0) < 0.001
 
+    def test_picture_geometry_contain_and_cover(self):
+        """Contain should letterbox, cover should overflow, both centered"""
+        assert picture_geometry(100, 50, 1000, 1000, cover=False) == (0, 250, 1000, 500)
+        assert picture_geometry(100, 50, 1000, 1000, cover=True) == (-500, 0, 2000, 1000)
+
     def test_confirm_overwrite_force_mode(self, tmp_path):
         """Force mode should always return True"""
         existing_file = tmp_path / "existing.pptx"
@@ -281,6 +408,699 @@ class TestBuildPresentation:
 
         assert output.exists()
 
+    @pytest.mark.integration
+    def test_build_presentation_reuses_repeated_image(self, tmp_path):
+        """A repeated image should be embedded once and shown on every slide"""
+        import zipfile
+        from PIL import Image
+        from pptx import Presentation
+
+        img_path = tmp_path / "logo.png"
+        Image.new("RGB", (100, 100), color="purple").save(img_path)
+
+        output = tmp_path / "repeat.pptx"
+        build_presentation(
+            images=[img_path, img_path, img_path],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fit",
+        )
+
+        media = [n for n in zipfile.ZipFile(output).namelist() if n.startswith("ppt/media/")]
+        assert len(media) == 1
+        assert len(Presentation(str(output)).slides) == 3
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("private_api", [True, False])
+    def test_build_presentation_slides_in_input_order(self, tmp_path, monkeypatch, private_api):
+        """Slides should follow the input order, each with its own slide ID"""
+        from PIL import Image
+        from pptx import Presentation
+
+        import pptx_builder.core as core
+
+        # Without python-pptx's internals, slides are appended with add_slide
+        monkeypatch.setattr(core.SlideAppender, "supported", staticmethod(lambda prs: private_api))
+        images = []
+        for i in range(5):
+            img_path = tmp_path / f"img_{i}.png"
+            Image.new("RGB", (100 + i, 100)).save(img_path)
+            images.append(img_path)
+
+        output = tmp_path / "ordered.pptx"
+        build_presentation(images, output, 10.0, 7.5, "fit")
+
+        slides = list(Presentation(str(output)).slides)
+        assert [s.shapes[0].image.size[0] for s in slides] == [100, 101, 102, 103, 104]
+        assert len({s.slide_id for s in slides}) == 5
+
+    @pytest.mark.integration
+    def test_build_presentation_stores_media_uncompressed(self, tmp_path):
+        """Already-compressed media should be stored; XML parts still deflated"""
+        import zipfile
+        from PIL import Image
+        from pptx import Presentation
+
+        img_path = tmp_path / "photo.jpg"
+        Image.new("RGB", (64, 48), color="red").save(img_path)
+
+        output = tmp_path / "stored.pptx"
+        build_presentation(
+            images=[img_path],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fit",
+        )
+
+        infos = {i.filename: i.compress_type for i in zipfile.ZipFile(output).infolist()}
+        assert infos["ppt/media/image1.jpg"] == zipfile.ZIP_STORED
+        assert infos["ppt/presentation.xml"] == zipfile.ZIP_DEFLATED
+        assert len(Presentation(str(output)).slides) == 1
+
+    @pytest.mark.integration
+    def test_build_presentation_saves_without_private_writer(self, tmp_path, monkeypatch):
+        """Without python-pptx's private writer classes, decks should save the stock way"""
+        import zipfile
+        from PIL import Image
+        from pptx import Presentation
+
+        import pptx_builder.core as core
+
+        monkeypatch.setattr(core, "STORED_MEDIA_WRITER", False)
+        img_path = tmp_path / "photo.jpg"
+        Image.new("RGB", (64, 48), color="red").save(img_path)
+
+        output = tmp_path / "stock.pptx"
+        build_presentation(
+            images=[img_path],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fit",
+        )
+
+        infos = {i.filename: i.compress_type for i in zipfile.ZipFile(output).infolist()}
+        assert infos["ppt/media/image1.jpg"] == zipfile.ZIP_DEFLATED
+        assert len(Presentation(str(output)).slides) == 1
+
+    @pytest.mark.integration
+    def test_build_presentation_accepts_in_memory_images(self, tmp_path):
+        """In-memory encoded images should work alongside file paths"""
+        import io
+        from PIL import Image
+        from pptx import Presentation
+
+        buf = io.BytesIO()
+        Image.new("RGB", (160, 90), color="navy").save(buf, "PNG")
+        img_path = tmp_path / "file.png"
+        Image.new("RGB", (90, 160), color="gold").save(img_path)
+
+        output = tmp_path / "streams.pptx"
+        build_presentation(
+            images=[buf, img_path],
+            output_path=output,
+            slide_width_in=13.333,
+            slide_height_in=7.5,
+            mode="fit",
+        )
+
+        assert len(Presentation(str(output)).slides) == 2
+
+    @pytest.mark.integration
+    def test_build_presentation_downscales_to_max_image_dpi(self, tmp_path):
+        """Images sharper than max_image_dpi at slide size should be shrunk before embedding"""
+        from PIL import Image
+        from pptx import Presentation
+
+        img_path = tmp_path / "large.png"
+        Image.new("RGB", (2000, 1500), color="green").save(img_path)
+
+        output = tmp_path / "small.pptx"
+        build_presentation(
+            images=[img_path],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fit",
+            max_image_dpi=20,
+        )
+
+        pic = Presentation(str(output)).slides[0].shapes[0]
+        assert pic.image.size == (200, 150)
+        assert (pic.width, pic.height) == (Emu(9144000), Emu(6858000))
+
+    @pytest.mark.integration
+    def test_build_presentation_keeps_pdf_pages_at_rendered_size(self, tmp_path):
+        """max_image_dpi should shrink image files but never resample rendered PDF pages"""
+        import io
+        from PIL import Image
+        from pptx import Presentation
+
+        page = io.BytesIO()
+        Image.new("RGB", (1275, 1650), color="white").save(page, "PNG")
+        img_path = tmp_path / "photo.png"
+        Image.new("RGB", (2000, 1500), color="green").save(img_path)
+
+        output = tmp_path / "mixed.pptx"
+        build_presentation(
+            images=[img_path],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fit",
+            max_image_dpi=20,
+            pdf_pages=[page],
+        )
+
+        slides = Presentation(str(output)).slides
+        assert slides[0].shapes[0].image.size == (1275, 1650)
+        assert slides[1].shapes[0].image.size == (200, 150)
+
+    @pytest.mark.integration
+    def test_build_presentation_downscales_cmyk_image(self, tmp_path):
+        """Downscaled images in modes PNG cannot hold (CMYK) should be converted, not fail"""
+        from PIL import Image
+        from pptx import Presentation
+
+        img_path = tmp_path / "print.tif"
+        Image.new("CMYK", (2000, 1500), color=(0, 255, 255, 0)).save(img_path)
+
+        output = tmp_path / "cmyk.pptx"
+        build_presentation(
+            images=[img_path],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fit",
+            max_image_dpi=20,
+        )
+
+        image = Presentation(str(output)).slides[0].shapes[0].image
+        assert image.content_type == "image/png"
+        assert image.size == (200, 150)
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("max_image_dpi", [None, 40])
+    def test_build_presentation_honors_exif_rotation(self, tmp_path, max_image_dpi):
+        """A landscape JPEG tagged as rotated 90 degrees should be placed as portrait"""
+        from PIL import Image
+        from pptx import Presentation
+
+        img_path = tmp_path / "phone.jpg"
+        exif = Image.Exif()
+        exif[274] = 6  # Rotate 90 CW to display
+        Image.new("RGB", (2000, 1500), color="navy").save(img_path, exif=exif)
+
+        output = tmp_path / "rotated.pptx"
+        build_presentation(
+            images=[img_path],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fit",
+            max_image_dpi=max_image_dpi,
+        )
+
+        pic = Presentation(str(output)).slides[0].shapes[0]
+        assert pic.height == Emu(6858000)
+        assert pic.width == Emu(6858000 * 3 // 4)
+        if max_image_dpi:
+            # Downscaled bytes lose the EXIF tag, so the rotation is applied to the pixels
+            assert pic.image.size == (225, 300)
+
+    @pytest.mark.integration
+    def test_build_presentation_converts_formats_pptx_cannot_hold(self, tmp_path):
+        """WebP (and HEIC, ICO, ...) should be embedded as PNG; PNG and JPEG as they are"""
+        from PIL import Image
+        from pptx import Presentation
+
+        webp = tmp_path / "photo.webp"
+        Image.new("RGB", (160, 120), color="purple").save(webp)
+        jpeg = tmp_path / "photo.jpg"
+        Image.new("RGB", (160, 120), color="purple").save(jpeg)
+
+        output = tmp_path / "formats.pptx"
+        build_presentation(
+            images=[webp, jpeg],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fit",
+        )
+
+        images = [slide.shapes[0].image for slide in Presentation(str(output)).slides]
+        assert [image.content_type for image in images] == ["image/png", "image/jpeg"]
+        assert images[0].size == (160, 120)
+        assert images[1].blob == jpeg.read_bytes()
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("private_api", [True, False])
+    def test_build_presentation_dedupes_identical_content(self, tmp_path, monkeypatch, private_api):
+        """Byte-identical images under different names should share one media part"""
+        import shutil
+        import zipfile
+        from PIL import Image
+
+        import pptx_builder.core as core
+
+        # Without python-pptx's internals, pictures go through shapes.add_picture
+        monkeypatch.setattr(core.ImagePartCache, "supported", staticmethod(lambda s: private_api))
+
+        first = tmp_path / "a.png"
+        Image.new("RGB", (120, 80), color="orange").save(first)
+        shutil.copy(first, tmp_path / "b.png")
+        Image.new("RGB", (80, 120), color="teal").save(tmp_path / "c.png")
+
+        output = tmp_path / "dedupe.pptx"
+        build_presentation(
+            images=[first, tmp_path / "b.png", tmp_path / "c.png"],
+            output_path=output,
+            slide_width_in=10.0,
+            slide_height_in=7.5,
+            mode="fill",
+        )
+
+        media = [n for n in zipfile.ZipFile(output).namelist() if n.startswith("ppt/media/")]
+        assert sorted(media) == ["ppt/media/image1.png", "ppt/media/image2.png"]
+
+
+@pytest.fixture(scope="module")
+def web():
+    """The web UI module; its tests are skipped without the [web] extra (gradio)."""
+    pytest.importorskip("gradio")
+    from pptx_builder import web
+
+    return web
+
+
+class TestWebUploadOrder:
+    """Test how the web UI orders uploaded images"""
+
+    def test_natural_sort_key_orders_numbers_numerically(self, web):
+        """page2 should come before page10, not after it"""
+        names = ["page10.png", "page2.png", "page1.png"]
+        assert sorted(names, key=web.natural_sort_key) == ["page1.png", "page2.png", "page10.png"]
+
+    def test_natural_sort_key_mixed_digits_and_letters(self, web):
+        """Names starting with digits, or alternating runs, should compare without errors"""
+        names = ["b2c10.png", "10.png", "b2c9.png", "a.png", "9b.png", "b10c1.png"]
+        assert sorted(names, key=web.natural_sort_key) == [
+            "9b.png",
+            "10.png",
+            "a.png",
+            "b2c9.png",
+            "b2c10.png",
+            "b10c1.png",
+        ]
+
+    def test_natural_sort_key_ignores_case(self, web):
+        """Upper- and lowercase spellings of a name should sort together"""
+        assert web.natural_sort_key("Slide2.PNG") == web.natural_sort_key("slide2.png")
+        names = ["b.png", "A.png", "C.png"]
+        assert sorted(names, key=web.natural_sort_key) == ["A.png", "b.png", "C.png"]
+
+    def test_natural_sort_key_equal_prefixes(self, web):
+        """A name that is a prefix of another should sort first; leading zeros should not matter"""
+        names = ["scan1.png", "scan.png", "scan1a.png", "scan01.png"]
+        assert sorted(names, key=web.natural_sort_key) == [
+            "scan.png",
+            "scan1.png",
+            "scan01.png",
+            "scan1a.png",
+        ]
+
+
+class TestWebUploads:
+    """Test how the web UI inspects and deduplicates uploads"""
+
+    @pytest.fixture
+    def build(self, web, tmp_path, monkeypatch):
+        """Run process_files in-process (thread pool), returning the built deck"""
+        import asyncio
+        from pptx import Presentation
+
+        monkeypatch.setattr(web, "APP_TEMP_ROOT", tmp_path)
+        monkeypatch.setattr(web, "JANITOR", object())  # don't start the sweeper
+        monkeypatch.setattr(web, "RENDER_CACHE_ENABLED", False)
+        monkeypatch.setattr(web, "get_executor", lambda: None)
+
+        def build(files, slide_size=web.DEFAULT_SLIDE_SIZE, dpi=150):
+            path, job = asyncio.run(
+                web.process_files([str(f) for f in files], slide_size, "Fit whole image", dpi)
+            )
+            return Presentation(path), job
+
+        return build
+
+    def test_inspect_upload_hashes_content(self, web, tmp_path):
+        """Identical bytes under different names should get the same size and digest"""
+        import hashlib
+
+        first = tmp_path / "a.pdf"
+        first.write_bytes(b"%PDF same bytes")
+        second = tmp_path / "b.pdf"
+        second.write_bytes(b"%PDF same bytes")
+
+        assert web.inspect_upload(str(first)) == web.inspect_upload(str(second))
+        assert web.inspect_upload(str(first)) == (
+            15,
+            hashlib.sha256(b"%PDF same bytes").hexdigest(),
+        )
+
+    def test_inspect_upload_empty_file(self, web, tmp_path):
+        """An empty upload cannot be mmapped; it should still get the empty digest"""
+        import hashlib
+
+        empty = tmp_path / "empty.png"
+        empty.touch()
+
+        assert web.inspect_upload(str(empty)) == (0, hashlib.sha256().hexdigest())
+
+    def test_inspect_upload_skips_hashing_oversized_files(self, web, tmp_path, monkeypatch):
+        """Files about to be rejected for size should not be hashed"""
+        monkeypatch.setattr(web, "MAX_FILE_SIZE", 4)
+        big = tmp_path / "big.pdf"
+        big.write_bytes(b"12345")
+
+        assert web.inspect_upload(str(big)) == (5, "")
+
+    def test_process_files_rejects_empty_upload(self, build, tmp_path):
+        """An empty image should fail with a user-facing error, not crash the worker"""
+        import gradio as gr
+
+        empty = tmp_path / "empty.png"
+        empty.touch()
+
+        with pytest.raises(gr.Error):
+            build([empty])
+
+    def test_process_files_renders_duplicate_pdf_once(self, web, build, tmp_path, monkeypatch):
+        """The same PDF uploaded twice should be rendered once but keep all its slides"""
+        import shutil
+        import zipfile
+
+        import pptx_builder.core as core
+
+        pdf = make_pdf(tmp_path / "doc.pdf", 3)
+        copy = tmp_path / "doc_copy.pdf"
+        shutil.copy(pdf, copy)
+        renders = []
+        render = core.iter_pdf_images
+        monkeypatch.setattr(
+            core,
+            "iter_pdf_images",
+            lambda path, *a, **kw: renders.append(path) or render(path, *a, **kw),
+        )
+
+        prs, job = build([pdf, copy])
+
+        assert renders == [pdf]
+        assert len(prs.slides) == 6
+        with zipfile.ZipFile(job.temp_dir / "presentation.pptx") as zf:
+            assert len([n for n in zf.namelist() if n.startswith("ppt/media/")]) == 3
+
+    def test_process_files_accepts_float_dpi(self, build, tmp_path):
+        """The web API sends the DPI slider as a float; PDFs should still convert"""
+        pdf = make_pdf(tmp_path / "doc.pdf", 1)
+
+        prs, _ = build([pdf], dpi=20.0)
+
+        assert prs.slides[0].shapes[0].image.size == (200, 150)
+
+    def test_process_files_recreates_removed_root(self, web, build, tmp_path, monkeypatch):
+        """Requests should still work after the app temp root was deleted from under us"""
+        from PIL import Image
+
+        monkeypatch.setattr(web, "APP_TEMP_ROOT", tmp_path / "swept")
+        image = tmp_path / "photo.png"
+        Image.new("RGB", (40, 30), color="gray").save(image)
+
+        prs, job = build([image])
+
+        assert len(prs.slides) == 1
+        assert job.temp_dir.parent == tmp_path / "swept"
+
+    def test_process_files_embeds_duplicate_images_once_in_order(self, build, tmp_path):
+        """Duplicate images should share one media part while every slide keeps its place"""
+        import shutil
+        import zipfile
+        from PIL import Image
+
+        Image.new("RGB", (100, 50), color="red").save(tmp_path / "img2.png")
+        Image.new("RGB", (50, 100), color="blue").save(tmp_path / "img10.png")
+        shutil.copy(tmp_path / "img2.png", tmp_path / "img3.png")
+
+        prs, job = build([tmp_path / "img10.png", tmp_path / "img3.png", tmp_path / "img2.png"])
+
+        # Natural name order (img2, img3, img10), img3 showing img2's content
+        sizes = [slide.shapes[0].image.size for slide in prs.slides]
+        assert sizes == [(100, 50), (100, 50), (50, 100)]
+        with zipfile.ZipFile(job.temp_dir / "presentation.pptx") as zf:
+            assert len([n for n in zf.namelist() if n.startswith("ppt/media/")]) == 2
+
+    @pytest.mark.parametrize(
+        "slide_size, pdf, expected",
+        [
+            ("Auto (match PDF)", True, (Emu(9144000), Emu(6858000))),  # the 10" x 7.5" page
+            ("Auto (match PDF)", False, (Emu(12192000), Emu(6858000))),  # 16:9 fallback
+            ("16:9 (Widescreen)", True, (Emu(12192000), Emu(6858000))),  # explicit preset
+        ],
+    )
+    def test_process_files_auto_slide_size(self, web, build, tmp_path, slide_size, pdf, expected):
+        """Only "Auto" should size slides after a single PDF's page"""
+        from PIL import Image
+
+        if pdf:
+            upload = make_pdf(tmp_path / "doc.pdf", 1)
+        else:
+            upload = tmp_path / "photo.png"
+            Image.new("RGB", (40, 30), color="gray").save(upload)
+
+        prs, _ = build([upload], slide_size)
+
+        assert web.DEFAULT_SLIDE_SIZE == "Auto (match PDF)"
+        assert (prs.slide_width, prs.slide_height) == expected
+
+
+class TestWebRenderCache:
+    """Test the opt-in render cache of the web UI"""
+
+    @pytest.fixture
+    def cache_root(self, web, tmp_path, monkeypatch):
+        root = tmp_path / "render_cache"
+        root.mkdir()
+        monkeypatch.setattr(web, "RENDER_CACHE_ROOT", root)
+        return root
+
+    def make_entry(self, root, key, pages):
+        entry = root / key
+        entry.mkdir()
+        for i in range(pages):
+            (entry / f"page_{i + 1:04d}.png").write_bytes(b"page %d" % i)
+        return entry
+
+    def test_load_cached_pages_links_every_page(self, web, cache_root, tmp_path, monkeypatch):
+        """A complete entry should be linked into the request dir, in page order"""
+        monkeypatch.setattr(web, "pdf_page_count", lambda path: 2)
+        self.make_entry(cache_root, "key", 2)
+        request_dir = tmp_path / "request"
+        request_dir.mkdir()
+
+        pages = web.load_cached_pages("key", request_dir, tmp_path / "doc.pdf")
+
+        assert [p.name for p in pages] == ["page_0001.png", "page_0002.png"]
+        assert all(p.parent.parent == request_dir for p in pages)
+        assert pages[1].read_bytes() == b"page 1"
+
+    def test_load_cached_pages_drops_entry_with_wrong_page_count(
+        self, web, cache_root, tmp_path, monkeypatch
+    ):
+        """An entry whose page count differs from the PDF should be a miss, and dropped"""
+        monkeypatch.setattr(web, "pdf_page_count", lambda path: 3)
+        self.make_entry(cache_root, "key", 2)
+
+        assert web.load_cached_pages("key", tmp_path, tmp_path / "doc.pdf") is None
+        assert list(cache_root.iterdir()) == []
+
+    def test_load_cached_pages_miss(self, web, cache_root, tmp_path):
+        """A key that was never stored should be a miss"""
+        assert web.load_cached_pages("missing", tmp_path, tmp_path / "doc.pdf") is None
+
+    def test_discard_cache_entry_renames_before_deleting(self, web, cache_root, monkeypatch):
+        """Eviction should move the entry aside first, so readers never see part of it"""
+        entry = self.make_entry(cache_root, "key", 3)
+        seen = []
+
+        def remove(path):
+            seen.append((entry.exists(), Path(path).parent == cache_root))
+            web.shutil.rmtree(path)
+
+        monkeypatch.setattr(web, "remove_temp_dir", remove)
+        web.discard_cache_entry(entry)
+
+        assert seen == [(False, True)]
+        assert list(cache_root.iterdir()) == []
+
+
+class TestWebTempDirs:
+    """Test temp directory cleanup of the web UI"""
+
+    def test_import_has_no_side_effects(self, web, tmp_path, monkeypatch):
+        """Pool workers re-import the module: no UI and no temp root until first use"""
+        root = tmp_path / "pptx_builder_root_test"
+        monkeypatch.setattr(web, "APP_TEMP_ROOT", root)
+        monkeypatch.setattr(web, "RENDER_CACHE_ROOT", root / "render_cache")
+        monkeypatch.setattr(web, "RENDER_CACHE_ENABLED", True)
+        monkeypatch.setattr(web, "APP_TEMP_ROOT_CREATED", True)  # skip the atexit hook
+
+        assert not hasattr(web, "app")
+        assert not root.exists()
+        web.ensure_app_temp_root()
+        assert (root / "render_cache").is_dir()
+
+    def test_cleanup_old_files_spares_live_server_roots(self, web, tmp_path, monkeypatch):
+        """Startup should sweep roots of exited servers only, and stale legacy request dirs"""
+        import subprocess
+        import sys
+
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        prefix = web.APP_ROOT_PREFIX
+        names = {
+            f"{prefix}{os.getpid()}_own": True,
+            f"{prefix}{os.getppid()}_idle": True,  # another live process
+            f"{prefix}{exited.pid}_killed": False,
+            f"{prefix}nopid": True,
+            "pptx_builder_legacy_old": False,
+            "pptx_builder_legacy_new": True,
+        }
+        old = time.time() - web.MAX_TEMP_AGE - 60
+        for name in names:
+            (tmp_path / name).mkdir()
+            if name != "pptx_builder_legacy_new":
+                os.utime(tmp_path / name, (old, old))
+        monkeypatch.setattr(web, "TEMP_ROOT", tmp_path)
+
+        web.cleanup_old_files()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+            n for n, k in names.items() if k
+        )
+
+    @staticmethod
+    def vanishing_scandir(monkeypatch, web):
+        """Make every dir vanish between os.scandir and the entry's stat (a Job finalizer race)"""
+        import shutil
+
+        scandir = os.scandir
+
+        class Entries(list):
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return None
+
+        def vanishing(path):
+            with scandir(path) as it:
+                entries = Entries(it)
+            for entry in entries:
+                shutil.rmtree(entry.path)
+            return entries
+
+        monkeypatch.setattr(web.os, "scandir", vanishing)
+
+    def test_remove_old_dirs_tolerates_vanishing_dirs(self, web, tmp_path, monkeypatch):
+        """A dir deleted mid-sweep should be skipped, not abort the sweep"""
+        (tmp_path / "pptx_builder_gone").mkdir()
+        self.vanishing_scandir(monkeypatch, web)
+
+        web.remove_old_dirs(tmp_path, prefix="pptx_builder_")
+
+    def test_evict_render_cache_tolerates_vanishing_entries(self, web, tmp_path, monkeypatch):
+        """Cache entries discarded mid-sweep should be skipped, and a missing cache ignored"""
+        monkeypatch.setattr(web, "RENDER_CACHE_ROOT", tmp_path / "render_cache")
+        web.evict_render_cache()
+
+        (tmp_path / "render_cache" / "key").mkdir(parents=True)
+        self.vanishing_scandir(monkeypatch, web)
+        web.evict_render_cache()
+
+    def test_janitor_survives_a_failed_sweep(self, web, monkeypatch):
+        """An error in one sweep should be logged and the next sweep still run"""
+        import asyncio
+
+        calls = []
+
+        def sweep(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise FileNotFoundError("removed meanwhile")
+
+        monkeypatch.setattr(web, "JANITOR_INTERVAL", 0)
+        monkeypatch.setattr(web, "RENDER_CACHE_ENABLED", False)
+        monkeypatch.setattr(web, "remove_old_dirs", sweep)
+
+        async def run():
+            task = asyncio.ensure_future(web.janitor())
+            while len(calls) < 2 and not task.done():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            return task
+
+        task = asyncio.run(asyncio.wait_for(run(), timeout=10))
+        assert len(calls) >= 2
+        assert task.cancelled()
+
+    def test_remove_temp_dir_removes_nested_tree(self, web, tmp_path):
+        """Files, nested dirs and symlinks should all go, without following the links"""
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "keep.txt").write_text("keep")
+        root = tmp_path / "job"
+        (root / "pages" / "deep").mkdir(parents=True)
+        (root / "deck.pptx").write_bytes(b"deck")
+        (root / "pages" / "page_0001.png").write_bytes(b"page")
+        (root / "pages" / "deep" / "page_0002.png").write_bytes(b"page")
+        (root / "pages" / "link").symlink_to(outside, target_is_directory=True)
+
+        web.remove_temp_dir(str(root))
+
+        assert not root.exists()
+        assert (outside / "keep.txt").read_text() == "keep"
+
+    def test_remove_temp_dir_missing_dir(self, web, tmp_path):
+        """Removing a dir that is already gone should be a no-op"""
+        web.remove_temp_dir(str(tmp_path / "gone"))
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_remove_old_dirs_honors_age_and_prefix(self, web, tmp_path):
+        """Only prefixed dirs older than MAX_TEMP_AGE should be removed"""
+        old = time.time() - web.MAX_TEMP_AGE - 60
+        for name in ("pptx_builder_old", "pptx_builder_new", "other_old"):
+            (tmp_path / name / "sub").mkdir(parents=True)
+            (tmp_path / name / "sub" / "page.png").write_bytes(b"page")
+        for name in ("pptx_builder_old", "other_old"):
+            os.utime(tmp_path / name, (old, old))
+        stale_file = tmp_path / "pptx_builder_file"
+        stale_file.write_bytes(b"not a dir")
+        os.utime(stale_file, (old, old))
+
+        web.remove_old_dirs(tmp_path, prefix="pptx_builder_")
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "other_old",
+            "pptx_builder_file",
+            "pptx_builder_new",
+        ]
+
+    def test_remove_old_dirs_missing_root(self, web, tmp_path):
+        """A root that does not exist (yet) should be skipped"""
+        web.remove_old_dirs(tmp_path / "missing")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])